@@ -7,15 +7,17 @@ Runs backups on a schedule and automatically cleans up old backups
 import os
 import sys
 import json
-import gzip
-import shutil
 import argparse
-import subprocess
 import logging
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
 import time
-import schedule
+
+try:
+    import orjson  # Optional: faster JSON parsing
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -28,15 +30,69 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+BACKUP_PREFIX = 'plex_library_'
+BACKUP_SUFFIXES = ('.json', '.json.gz')
+TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+REQUIRED_CONFIG_FIELDS = ['plex_url', 'plex_token']
+CLEANUP_INTERVAL = 6 * 60 * 60  # Minimum seconds between scheduled retention cleanups
+SCHEDULER_MAX_WAIT = 60 * 60  # Longest single wait so clock changes are picked up
+
+# Log banners
+BANNER_EQ = "=" * 60
+BANNER_DASH = "-" * 80
+
+
+def backup_timestamp(name: str):
+    """
+    Extract the timestamp embedded in a backup filename
+    
+    Args:
+        name: Filename such as plex_library_20240101_020000.json.gz
+        
+    Returns:
+        The 'YYYYMMDD_HHMMSS' string, or None if the name doesn't carry one
+    """
+    stamp = name[len(BACKUP_PREFIX):].split('.', 1)[0]
+    if len(stamp) == 15 and stamp[8] == '_' and stamp[:8].isdigit() and stamp[9:].isdigit():
+        return stamp
+    return None
+
+
+def parse_hhmm(value: str):
+    """
+    Parse a 24-hour HH:MM time (argparse type)
+    
+    Returns:
+        (hour, minute) tuple
+    
+    Raises:
+        argparse.ArgumentTypeError: If the value isn't a valid HH:MM time
+    """
+    hour, sep, minute = value.partition(':')
+    # 1-2 digits each; isdigit() alone also accepts non-ASCII digits like '²', which int() rejects
+    if sep and 1 <= len(hour) <= 2 and 1 <= len(minute) <= 2 and (hour + minute).isascii() and hour.isdigit() and minute.isdigit():
+        hour_num, minute_num = int(hour), int(minute)
+        if hour_num < 24 and minute_num < 60:
+            return hour_num, minute_num
+    raise argparse.ArgumentTypeError(f"Invalid time format: {value}. Use HH:MM")
+
 
 class BackupScheduler:
     """Manages scheduled backups and retention"""
     
-    def __init__(self, config_file='config.json', backup_dir='backups'):
+    def __init__(self, config_file='config.json', backup_dir='backups', use_subprocess=False):
         self.config_file = Path(config_file)
         self.backup_dir = Path(backup_dir)
         self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self._config_mtime = None  # mtime of config.json when self.config was read
         self.config = self._load_config()
+        self.use_subprocess = use_subprocess  # Run plex_overseerr_backup.py as a child process
+        # Known backups: filename -> os.stat_result (None until first stat'd).
+        # Kept across scheduled runs so an unchanged directory isn't re-walked.
+        self._backup_cache = None
+        self._backup_dir_mtime = None  # st_mtime_ns of backup_dir when it was last scanned
+        self._last_cleanup = None  # time.monotonic() of the last cleanup run
+        self._stop_event = threading.Event()
     
     def _load_config(self) -> dict:
         """Load configuration from config.json"""
@@ -46,12 +102,10 @@ class BackupScheduler:
             sys.exit(1)
         
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            config = self._read_config()
             
             # Validate required fields
-            required = ['plex_url', 'plex_token']
-            missing = [k for k in required if not config.get(k)]
+            missing = [k for k in REQUIRED_CONFIG_FIELDS if not config.get(k)]
             if missing:
                 logger.error(f"Missing config fields: {missing}")
                 logger.error("Configure in ui.py first")
@@ -62,119 +116,167 @@ class BackupScheduler:
             logger.error(f"Failed to load config: {e}")
             sys.exit(1)
     
-    def compress_backup(self, backup_file: Path) -> Path:
+    def _read_config(self) -> dict:
+        """Parse config.json and remember the mtime it was read at"""
+        self._config_mtime = self.config_file.stat().st_mtime
+        if orjson is not None:
+            with open(self.config_file, 'rb') as f:
+                return orjson.loads(f.read())
+        with open(self.config_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _get_config(self) -> dict:
         """
-        Compress backup file with gzip
+        Get the current config, re-reading config.json only if its mtime changed
         
-        Args:
-            backup_file: Path to the JSON backup file
-            
-        Returns:
-            Path to the compressed .json.gz file
+        Lets a long-running scheduler pick up settings saved from ui.py without
+        a restart. If the changed file can't be used, the previous config is kept.
         """
         try:
-            gz_file = backup_file.with_suffix('.json.gz')
-            
-            with open(backup_file, 'rb') as f_in:
-                with gzip.open(gz_file, 'wb', compresslevel=9) as f_out:
-                    shutil.copyfileobj(f_in, f_out)
-            
-            original_size = backup_file.stat().st_size
-            compressed_size = gz_file.stat().st_size
-            ratio = (1 - compressed_size / original_size) * 100
-            
-            logger.info(f"  Compressed: {original_size / 1024:.1f} KB → {compressed_size / 1024:.1f} KB ({ratio:.1f}% reduction)")
-            
-            # Remove original uncompressed file
-            backup_file.unlink()
-            
-            return gz_file
+            if self.config_file.stat().st_mtime == self._config_mtime:
+                return self.config
+            config = self._read_config()
         except Exception as e:
-            logger.error(f"Compression failed: {e}")
-            return backup_file  # Return original if compression fails
+            logger.warning(f"Failed to reload config, keeping previous settings: {e}")
+            return self.config
+        
+        missing = [k for k in REQUIRED_CONFIG_FIELDS if not config.get(k)]
+        if missing:
+            logger.warning(f"Reloaded config is missing {missing}, keeping previous settings")
+            return self.config
+        
+        logger.info(f"Reloaded config: {self.config_file}")
+        self.config = config
+        return config
     
     def run_backup(self, verify_files=True, libraries=None, compress=True, detailed_episodes=False):
         """Execute backup using plex_overseerr_backup.py"""
         try:
             # Generate unique filename with timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            backup_file = self.backup_dir / f"plex_library_{timestamp}.json"
+            timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+            # The export writes gzip itself when given a .json.gz path
+            suffix = '.json.gz' if compress else '.json'
+            backup_file = self.backup_dir / f"{BACKUP_PREFIX}{timestamp}{suffix}"
             
-            logger.info("="*60)
+            logger.info(BANNER_EQ)
             logger.info(f"Starting backup: {backup_file.name}")
             if detailed_episodes:
                 logger.info("Detailed episode tracking enabled")
-            logger.info("="*60)
-            
-            # Build command
-            cmd = [
-                sys.executable, '-u', 'plex_overseerr_backup.py',
-                '--plex-url', self.config['plex_url'],
-                '--plex-token', self.config['plex_token'],
-                '--export', str(backup_file)
-            ]
-            
-            if not verify_files:
-                cmd.append('--no-verify')
-            
-            if detailed_episodes:
-                cmd.append('--detailed-episodes')
-            
-            if libraries:
-                cmd.extend(['--libraries'] + libraries)
-            
-            # Run backup
-            result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='replace')
+            logger.info(BANNER_EQ)
             
-            # Log output
-            if result.stdout:
-                logger.info(result.stdout)
-            if result.stderr:
-                logger.warning(result.stderr)
+            cache_current = self._backup_cache_current()
+            if self.use_subprocess:
+                returncode = self._export_subprocess(backup_file, verify_files, libraries, detailed_episodes)
+            else:
+                returncode = self._export_in_process(backup_file, verify_files, libraries, detailed_episodes)
             
-            if result.returncode == 0:
+            if returncode == 0:
                 logger.info(f"✓ Backup successful: {backup_file}")
-                logger.info(f"  File size: {backup_file.stat().st_size / 1024:.1f} KB")
-                
-                # Compress if requested
-                if compress and backup_file.exists():
-                    backup_file = self.compress_backup(backup_file)
+                st = backup_file.stat()
+                logger.info(f"  File size: {st.st_size / 1024:.1f} KB")
                 
+                self._remember_backup(backup_file, st, cache_current)
                 return backup_file
             else:
-                logger.error(f"✗ Backup failed with code {result.returncode}")
+                logger.error(f"✗ Backup failed with code {returncode}")
                 return None
                 
         except Exception as e:
             logger.error(f"Backup error: {e}")
             return None
     
+    def _export_in_process(self, backup_file: Path, verify_files, libraries, detailed_episodes) -> int:
+        """
+        Run the export by importing plex_overseerr_backup
+        
+        Returns:
+            0 on success, 1 on failure (mirrors the script's exit code)
+        """
+        from plex_overseerr_backup import run_export
+        
+        config = self._get_config()
+        try:
+            run_export(
+                config['plex_url'],
+                config['plex_token'],
+                str(backup_file),
+                libraries=libraries,
+                verify_files=verify_files,
+                detailed_episodes=detailed_episodes
+            )
+        except RuntimeError as e:
+            logger.error(str(e))
+            return 1
+        
+        # export_library logs and carries on if the file couldn't be written
+        return 0 if backup_file.exists() else 1
+    
+    def _export_subprocess(self, backup_file: Path, verify_files, libraries, detailed_episodes) -> int:
+        """
+        Run the export as a separate plex_overseerr_backup.py process
+        
+        Returns:
+            The script's exit code
+        """
+        import subprocess
+        
+        config = self._get_config()
+        cmd = [
+            sys.executable, '-u', 'plex_overseerr_backup.py',
+            '--plex-url', config['plex_url'],
+            '--plex-token', config['plex_token'],
+            '--export', str(backup_file)
+        ]
+        
+        if not verify_files:
+            cmd.append('--no-verify')
+        
+        if detailed_episodes:
+            cmd.append('--detailed-episodes')
+        
+        if libraries:
+            cmd.extend(['--libraries'] + libraries)
+        
+        # Log output as it arrives
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, encoding='utf-8', errors='replace')
+        for line in process.stdout:
+            logger.info(line.rstrip())
+        return process.wait()
+    
     def cleanup_old_backups(self, days_to_keep=30):
         """Remove backups older than specified days"""
+        self._last_cleanup = time.monotonic()
         try:
             cutoff_date = datetime.now() - timedelta(days=days_to_keep)
-            cutoff_timestamp = cutoff_date.timestamp()
             
             removed_count = 0
             removed_size = 0
             
-            # Look for both .json and .json.gz files
-            patterns = ['plex_library_*.json', 'plex_library_*.json.gz']
-            backup_files = []
-            for pattern in patterns:
-                backup_files.extend(self.backup_dir.glob(pattern))
-            
-            for backup_file in sorted(backup_files):
-                file_mtime = backup_file.stat().st_mtime
-                
-                if file_mtime < cutoff_timestamp:
-                    file_size = backup_file.stat().st_size
-                    backup_file.unlink()
+            backups = self._scan_backups(refresh=True)
+            backup_dir = os.fspath(self.backup_dir)
+            # Resolve the directory once and unlink relative to it where supported
+            dir_fd = os.open(backup_dir, os.O_RDONLY) if os.unlink in os.supports_dir_fd else None
+            try:
+                for name in self._expired_backups(cutoff_date):
+                    try:
+                        st = self._stat_backup(name)
+                        os.unlink(name if dir_fd is not None else os.path.join(backup_dir, name), dir_fd=dir_fd)
+                    except FileNotFoundError:
+                        # Removed behind our back since the listing was cached
+                        backups.pop(name, None)
+                        continue
+                    
+                    backups.pop(name, None)
                     removed_count += 1
-                    removed_size += file_size
-                    logger.info(f"Removed old backup: {backup_file.name}")
+                    removed_size += st.st_size
+                    logger.info(f"Removed old backup: {name}")
+            finally:
+                if dir_fd is not None:
+                    os.close(dir_fd)
             
             if removed_count > 0:
+                # The listing was current after the refresh above, and only our unlinks changed it
+                self._record_own_change(True)
                 logger.info(f"Cleanup complete: Removed {removed_count} backups ({removed_size / 1024:.1f} KB)")
             else:
                 logger.info(f"No backups older than {days_to_keep} days")
@@ -182,52 +284,150 @@ class BackupScheduler:
         except Exception as e:
             logger.error(f"Cleanup error: {e}")
     
+    def _expired_backups(self, cutoff_date: datetime) -> list:
+        """
+        Find backups older than the cutoff
+        
+        Timestamped filenames sort chronologically, so they are walked oldest
+        first and the walk stops at the first one newer than the cutoff - no
+        stat() needed. Names without a parseable timestamp fall back to mtime.
+        
+        Returns:
+            List of backup filenames to remove
+        """
+        cutoff_str = cutoff_date.strftime(TIMESTAMP_FORMAT)
+        cutoff_timestamp = cutoff_date.timestamp()
+        
+        expired = []
+        stamped = []
+        for name in list(self._scan_backups()):
+            stamp = backup_timestamp(name)
+            if stamp is not None:
+                stamped.append((stamp, name))
+                continue
+            try:
+                if self._stat_backup(name).st_mtime < cutoff_timestamp:
+                    expired.append(name)
+            except FileNotFoundError:
+                self._backup_cache.pop(name, None)
+        
+        stamped.sort()
+        for stamp, name in stamped:
+            if stamp >= cutoff_str:
+                break
+            expired.append(name)
+        return expired
+    
+    def _cleanup_due(self) -> bool:
+        """Check whether enough time has passed since the last cleanup"""
+        return self._last_cleanup is None or time.monotonic() - self._last_cleanup >= CLEANUP_INTERVAL
+    
+    def _scan_backups(self, refresh=False) -> dict:
+        """
+        Get known backups, scanning the backup directory on first use
+        
+        Args:
+            refresh: Rescan if the directory changed since the last scan
+                     (backups written by ui.py, the CLI or cron, or removed by hand)
+        
+        Returns:
+            Dict of .json/.json.gz backup filename -> os.stat_result (or None if not yet stat'd)
+        """
+        if refresh and not self._backup_cache_current():
+            self._backup_cache = None
+        if self._backup_cache is None:
+            self._backup_dir_mtime = os.stat(self.backup_dir).st_mtime_ns
+            backups = {}
+            with os.scandir(self.backup_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith(BACKUP_PREFIX) and name.endswith(BACKUP_SUFFIXES) and entry.is_file():
+                        backups[name] = None
+            self._backup_cache = backups
+        return self._backup_cache
+    
+    def _backup_cache_current(self) -> bool:
+        """Check whether the cached listing still matches the backup directory"""
+        return self._backup_cache is not None and os.stat(self.backup_dir).st_mtime_ns == self._backup_dir_mtime
+    
+    def _record_own_change(self, was_current: bool):
+        """
+        Keep the cached listing valid after our own write or unlink bumps the directory mtime
+        
+        Args:
+            was_current: Whether the cache matched the directory just before the change;
+                         if not, someone else changed it too and the next refresh must rescan
+        """
+        if was_current and self._backup_cache is not None:
+            self._backup_dir_mtime = os.stat(self.backup_dir).st_mtime_ns
+    
+    def _stat_backup(self, name: str) -> os.stat_result:
+        """Stat a known backup, reusing the cached result if there is one"""
+        backups = self._scan_backups()
+        st = backups.get(name)
+        if st is None:
+            st = (self.backup_dir / name).stat()
+            backups[name] = st
+        return st
+    
+    def _remember_backup(self, backup_file: Path, st=None, was_current=False):
+        """Record a freshly written backup (and its stat_result, if known) in the cached listing"""
+        if self._backup_cache is None:
+            return
+        self._backup_cache[backup_file.name] = st
+        self._record_own_change(was_current)
+    
     def list_backups(self):
         """List all existing backups"""
-        # Look for both .json and .json.gz files
-        patterns = ['plex_library_*.json', 'plex_library_*.json.gz']
-        backups = []
-        for pattern in patterns:
-            backups.extend(self.backup_dir.glob(pattern))
-        backups = sorted(backups, reverse=True)
+        # Everything below is INFO output - skip the scan entirely if it won't be shown
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        backups = sorted(self._scan_backups(refresh=True), reverse=True)
         
         if not backups:
             logger.info("No backups found")
             return
         
         logger.info("\nBackup History:")
-        logger.info("-" * 80)
+        logger.info(BANNER_DASH)
         
         total_size = 0
-        for backup in backups:
-            stat = backup.stat()
+        for name in backups:
+            stat = self._stat_backup(name)
             size_kb = stat.st_size / 1024
             total_size += stat.st_size
-            mtime = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
-            compressed = " (compressed)" if backup.suffix == '.gz' else ""
-            logger.info(f"  {backup.name}{compressed}")
-            logger.info(f"    Modified: {mtime}")
-            logger.info(f"    Size: {size_kb:.1f} KB")
+            mtime = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stat.st_mtime))
+            compressed = " (compressed)" if name.endswith('.gz') else ""
+            logger.info("  %s%s", name, compressed)
+            logger.info("    Modified: %s", mtime)
+            logger.info("    Size: %.1f KB", size_kb)
         
-        logger.info("-" * 80)
+        logger.info(BANNER_DASH)
         logger.info(f"Total backups: {len(backups)}")
         logger.info(f"Total size: {total_size / 1024:.1f} KB ({total_size / (1024*1024):.2f} MB)")
     
+    def _backup_job(self, verify_files, cleanup_days, compress, detailed_episodes):
+        """Scheduled job: run a backup, then apply retention if due"""
+        self.run_backup(verify_files=verify_files, compress=compress, detailed_episodes=detailed_episodes)
+        if self._cleanup_due():
+            self.cleanup_old_backups(days_to_keep=cleanup_days)
+    
     def schedule_daily(self, hour=2, minute=0, verify_files=True, cleanup_days=30, compress=True, detailed_episodes=False):
         """Schedule daily backup at specified time"""
-        time_str = f"{hour:02d}:{minute:02d}"
+        import schedule  # Only needed by the long-running scheduler modes
         
-        def backup_job():
-            self.run_backup(verify_files=verify_files, compress=compress, detailed_episodes=detailed_episodes)
-            self.cleanup_old_backups(days_to_keep=cleanup_days)
+        time_str = f"{hour:02d}:{minute:02d}"
         
-        schedule.every().day.at(time_str).do(backup_job)
+        schedule.every().day.at(time_str).do(self._backup_job, verify_files, cleanup_days, compress, detailed_episodes)
         logger.info(f"Scheduled daily backup at {time_str}")
         
         return self._run_scheduler()
     
     def schedule_weekly(self, day='sunday', hour=2, minute=0, verify_files=True, cleanup_days=30, compress=True, detailed_episodes=False):
         """Schedule weekly backup on specified day"""
+        import schedule
+        
         day = day.lower()
         valid_days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
         
@@ -237,24 +437,25 @@ class BackupScheduler:
         
         time_str = f"{hour:02d}:{minute:02d}"
         
-        def backup_job():
-            self.run_backup(verify_files=verify_files, compress=compress, detailed_episodes=detailed_episodes)
-            self.cleanup_old_backups(days_to_keep=cleanup_days)
-        
         day_method = getattr(schedule.every(), day)
-        day_method.at(time_str).do(backup_job)
+        day_method.at(time_str).do(self._backup_job, verify_files, cleanup_days, compress, detailed_episodes)
         logger.info(f"Scheduled weekly backup on {day} at {time_str}")
         
         return self._run_scheduler()
     
     def _run_scheduler(self):
         """Run the scheduler loop"""
+        import schedule
+        
         logger.info("Scheduler running. Press Ctrl+C to stop.")
         
         try:
-            while True:
+            while not self._stop_event.is_set():
                 schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                # Sleep until the next job is due rather than polling every minute
+                self._wait_for_next_run()
+            logger.info("Scheduler stopped")
+            return True
         except KeyboardInterrupt:
             logger.info("Scheduler stopped")
             return True
@@ -262,11 +463,41 @@ class BackupScheduler:
             logger.error(f"Scheduler error: {e}")
             return False
     
-    def generate_crontab_line(self, time_str, day=None):
+    def _wait_for_next_run(self):
+        """
+        Block until the next scheduled job is due (or stop() is called)
+        
+        The wait runs against a monotonic deadline taken from the job's absolute
+        run time, so early wakeups don't drift it. The deadline is re-anchored to
+        the wall clock every SCHEDULER_MAX_WAIT seconds to follow clock steps
+        (NTP, DST, suspend/resume).
+        """
+        import schedule
+        
+        while not self._stop_event.is_set():
+            next_run = schedule.next_run()
+            if next_run is None:
+                self._stop_event.wait(SCHEDULER_MAX_WAIT)
+                return
+            
+            deadline = time.monotonic() + (next_run - datetime.now()).total_seconds()
+            anchor_until = time.monotonic() + SCHEDULER_MAX_WAIT
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                if time.monotonic() >= anchor_until:
+                    break  # Re-read the wall clock
+                if self._stop_event.wait(min(remaining, anchor_until - time.monotonic())):
+                    return
+    
+    def stop(self):
+        """Wake the scheduler loop and make it exit"""
+        self._stop_event.set()
+    
+    def generate_crontab_line(self, hour, minute, day=None):
         """Generate crontab line for backup"""
         try:
-            hour, minute = map(int, time_str.split(':'))
-            
             if day:
                 day_num = {
                     'sunday': 0, 'monday': 1, 'tuesday': 2, 'wednesday': 3,
@@ -281,10 +512,9 @@ class BackupScheduler:
             logger.error(f"Error generating crontab: {e}")
             return None
     
-    def generate_windows_task(self, time_str, day=None):
+    def generate_windows_task(self, hour, minute, day=None):
         """Generate Windows Task Scheduler command"""
         try:
-            hour, minute = map(int, time_str.split(':'))
             cwd = os.getcwd()
             task_name = "PlexBackup"
             
@@ -405,11 +635,13 @@ Examples:
                        help='Skip gzip compression of backup')
     parser.add_argument('--detailed-episodes', action='store_true',
                        help='Track individual episode files for TV shows (slower)')
+    parser.add_argument('--subprocess', action='store_true',
+                       help='Run each backup in a separate plex_overseerr_backup.py process')
     parser.add_argument('--list', action='store_true',
                        help='List all backups')
     parser.add_argument('--cleanup', type=int, metavar='DAYS',
                        help='Remove backups older than DAYS')
-    parser.add_argument('--daily', metavar='HH:MM',
+    parser.add_argument('--daily', metavar='HH:MM', type=parse_hhmm,
                        help='Schedule daily backup at HH:MM (24-hour format)')
     parser.add_argument('--weekly', nargs=2, metavar=('DAY', 'HH:MM'),
                        help='Schedule weekly backup (e.g., sunday 02:00)')
@@ -417,15 +649,22 @@ Examples:
                        help='Verify files exist during backup (default: True)')
     parser.add_argument('--retention', type=int, default=30, metavar='DAYS',
                        help='Days to keep backups (default: 30)')
-    parser.add_argument('--crontab', metavar='HH:MM',
+    parser.add_argument('--crontab', metavar='HH:MM', type=parse_hhmm,
                        help='Generate crontab line for Linux/Mac (use with --daily or --weekly)')
-    parser.add_argument('--windows-task', metavar='HH:MM',
+    parser.add_argument('--windows-task', metavar='HH:MM', type=parse_hhmm,
                        help='Generate Windows Task Scheduler command (use with --daily or --weekly)')
     
     args = parser.parse_args()
     
+    if args.weekly:
+        try:
+            weekly_day = args.weekly[0]
+            weekly_hour, weekly_minute = parse_hhmm(args.weekly[1])
+        except argparse.ArgumentTypeError as e:
+            parser.error(f"argument --weekly: {e}")
+    
     # Create scheduler
-    scheduler = BackupScheduler(args.config, args.backup_dir)
+    scheduler = BackupScheduler(args.config, args.backup_dir, use_subprocess=args.subprocess)
     
     # Handle list command
     if args.list:
@@ -451,10 +690,9 @@ Examples:
     # Handle crontab generation
     if args.crontab:
         if args.weekly:
-            day, time_str = args.weekly
-            cron_line = scheduler.generate_crontab_line(args.crontab, day=day)
+            cron_line = scheduler.generate_crontab_line(*args.crontab, day=weekly_day)
         else:
-            cron_line = scheduler.generate_crontab_line(args.crontab)
+            cron_line = scheduler.generate_crontab_line(*args.crontab)
         
         if cron_line:
             logger.info("\n" + "="*70)
@@ -470,10 +708,9 @@ Examples:
     # Handle Windows task generation
     if args.windows_task:
         if args.weekly:
-            day, time_str = args.weekly
-            scheduler.generate_windows_task(args.windows_task, day=day)
+            scheduler.generate_windows_task(*args.windows_task, day=weekly_day)
         else:
-            scheduler.generate_windows_task(args.windows_task)
+            scheduler.generate_windows_task(*args.windows_task)
         return
     
     # Handle scheduling
@@ -482,36 +719,26 @@ Examples:
     detailed = args.detailed_episodes
     
     if args.daily:
-        try:
-            hour, minute = map(int, args.daily.split(':'))
-            scheduler.schedule_daily(
-                hour=hour,
-                minute=minute,
-                verify_files=verify,
-                cleanup_days=args.retention,
-                compress=compress,
-                detailed_episodes=detailed
-            )
-        except ValueError:
-            logger.error(f"Invalid time format: {args.daily}. Use HH:MM")
-            sys.exit(1)
+        hour, minute = args.daily
+        scheduler.schedule_daily(
+            hour=hour,
+            minute=minute,
+            verify_files=verify,
+            cleanup_days=args.retention,
+            compress=compress,
+            detailed_episodes=detailed
+        )
     
     elif args.weekly:
-        try:
-            day, time_str = args.weekly
-            hour, minute = map(int, time_str.split(':'))
-            scheduler.schedule_weekly(
-                day=day,
-                hour=hour,
-                minute=minute,
-                verify_files=verify,
-                cleanup_days=args.retention,
-                compress=compress,
-                detailed_episodes=detailed
-            )
-        except ValueError:
-            logger.error(f"Invalid time format: {time_str}. Use HH:MM")
-            sys.exit(1)
+        scheduler.schedule_weekly(
+            day=weekly_day,
+            hour=weekly_hour,
+            minute=weekly_minute,
+            verify_files=verify,
+            cleanup_days=args.retention,
+            compress=compress,
+            detailed_episodes=detailed
+        )
     
     else:
         parser.print_help()
@@ -12,16 +12,26 @@ import requests
 import json
 import sys
 import argparse
+import gzip
 import hashlib
+import operator
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional
 import logging
 import os
+import re
 import urllib3
 import warnings
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson  # Optional: much faster JSON encode/decode
+except ImportError:
+    orjson = None
 
 # Suppress SSL warnings and urllib3 warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -43,17 +53,237 @@ logger = logging.getLogger(__name__)
 
 # Constants
 REQUEST_TIMEOUT = 30
-OVERSEERR_DELAY = 1  # Delay between Overseerr requests to avoid rate limiting
+OVERSEERR_DELAY = 1  # Average delay between Overseerr requests to avoid rate limiting
+OVERSEERR_BURST = 5  # Requests allowed back-to-back before OVERSEERR_DELAY pacing applies
 MAX_RETRIES = 3
+RETRY_STATUSES = (502, 503, 504)  # Transient gateway errors retried for GET requests
+PLEX_PAGE_SIZE = 1000  # Items per /library/sections/{key}/all page
+PLEX_PAGE_WORKERS = 4  # Library pages fetched at once
+PLEX_METADATA_BATCH = 100  # Rating keys per bulk /library/metadata request
+PLEX_METADATA_WORKERS = 4  # Bulk metadata requests in flight at once
+HTTP_POOL_CONNECTIONS = 16  # Hosts kept in the connection pool
+HTTP_POOL_MAXSIZE = 64  # Keep-alive connections per host
+BACKUP_GZIP_LEVEL = 6  # Used when exporting straight to .json.gz
+LIBRARY_WORKERS = 4  # Libraries exported concurrently
+VERIFY_WORKERS = 32  # Parallel stat() calls when verifying files (network shares are latency-bound)
+
+# BLAKE2b (32-byte digest) outhashes SHA256 on CPUs without SHA extensions;
+# backups without a "checksum_algo" key are SHA256
+CHECKSUM_ALGORITHM = 'blake2b'
+LEGACY_CHECKSUM_ALGORITHM = 'sha256'
+
+# Trailing "checksum" key as written by export_library, indented (CRLF from older Windows
+# text-mode writes) or compact
+CHECKSUM_FIELD = re.compile(rb',(?:(\r?\n)  "checksum": |"checksum":)"[0-9a-f]{64}"(?:\r?\n)?}\s*$')
+# Plex external IDs, e.g. "tmdb://603"
+GUID_ID = re.compile(r'^(tmdb|tvdb|imdb)://(.+)$')
+# Fields every exported item starts from, extracted in one C-level call
+ITEM_FIELDS = operator.itemgetter('title', 'type', 'year', 'ratingKey')
+# Counters returned by export_library
+EXPORT_STATS = ('total_items', 'verified_items', 'missing_files', 'errors',
+                'movies', 'shows', 'episodes', 'missing_episodes')
+(STAT_TOTAL_ITEMS, STAT_VERIFIED_ITEMS, STAT_MISSING_FILES, STAT_ERRORS,
+ STAT_MOVIES, STAT_SHOWS, STAT_EPISODES, STAT_MISSING_EPISODES) = range(len(EXPORT_STATS))
+DEFAULT_SKIP_LIBRARIES = ['AudioBooks', "Mike's Audio Books"]
+
+
+def new_checksum(algo: str = CHECKSUM_ALGORITHM, data: bytes = b''):
+    """Create a hashlib object for a backup checksum algorithm (always a 32-byte digest)"""
+    if algo == 'blake2b':
+        return hashlib.blake2b(data, digest_size=32)
+    return hashlib.new(algo, data)
+
+
+def stat_file_size(file_path: str):
+    """
+    Stat a media file
+    
+    Returns:
+        Size in bytes, None if the file is missing, or the OSError raised
+    """
+    try:
+        return os.stat(file_path).st_size
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    except OSError as e:
+        return e
+
+
+def stat_directory_files(directory: str, names: Dict[str, str]) -> Dict[str, object]:
+    """
+    Get file sizes for one directory from a single scandir() listing
+    
+    Args:
+        directory: Directory to list
+        names: Normcased file name -> path, for the files wanted from it
+    
+    Returns:
+        Dict of file path -> stat_file_size() result
+    """
+    try:
+        results = dict.fromkeys(names.values())
+        with os.scandir(directory or os.curdir) as entries:
+            for entry in entries:
+                path = names.get(os.path.normcase(entry.name))
+                if path is not None:
+                    try:
+                        results[path] = entry.stat().st_size
+                    except OSError:
+                        results[path] = stat_file_size(path)
+        return results
+    except OSError:
+        return {path: stat_file_size(path) for path in names.values()}
+
+
+def stat_files(paths) -> Dict[str, object]:
+    """
+    Stat a batch of files concurrently
+    
+    Returns:
+        Dict of file path -> stat_file_size() result
+    """
+    paths = list(set(paths))
+    if not paths:
+        return {}
+    if len(paths) == 1:
+        return {paths[0]: stat_file_size(paths[0])}
+    
+    if os.name == 'nt':
+        # Windows directory listings already carry file sizes, so one scandir() per
+        # folder replaces a round-trip per file on network shares
+        by_directory = defaultdict(dict)
+        for path in paths:
+            directory, name = os.path.split(path)
+            by_directory[directory][os.path.normcase(name)] = path
+        
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(VERIFY_WORKERS, len(by_directory))) as pool:
+            for dir_results in pool.map(lambda item: stat_directory_files(*item), by_directory.items()):
+                results.update(dir_results)
+        for path in paths:
+            if path not in results:  # Same name in different case
+                results[path] = stat_file_size(path)
+        return results
+    
+    with ThreadPoolExecutor(max_workers=min(VERIFY_WORKERS, len(paths))) as pool:
+        return dict(zip(paths, pool.map(stat_file_size, paths)))
+
 
+def serialize_backup(backup_data: Dict, pretty: bool = True) -> bytes:
+    """Serialize backup (or progress) data to JSON bytes, indented or compact (orjson if installed)"""
+    if orjson is not None:
+        return orjson.dumps(backup_data, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(backup_data, indent=2).encode('utf-8')
+    return json.dumps(backup_data, separators=(',', ':')).encode('utf-8')
 
-def calculate_checksum(file_path: str) -> str:
-    """Calculate SHA256 checksum of a file"""
-    sha256 = hashlib.sha256()
-    with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(8192), b''):
-            sha256.update(chunk)
-    return sha256.hexdigest()
+
+def serialize_json_line(data: Dict) -> bytes:
+    """Serialize data as one compact line of JSON (JSON Lines)"""
+    if orjson is not None:
+        return orjson.dumps(data) + b'\n'
+    return json.dumps(data).encode('utf-8') + b'\n'
+
+
+def parse_json(raw: bytes):
+    """Parse JSON bytes (orjson if installed)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def backup_content_checksum(raw: bytes, algo: str = CHECKSUM_ALGORITHM) -> Optional[str]:
+    """
+    Checksum of a backup file's bytes with the trailing "checksum" key removed
+    
+    This is exactly what export_library hashed, whichever JSON library wrote
+    the file. Returns None if the checksum isn't the last key.
+    """
+    match = CHECKSUM_FIELD.search(raw, max(0, len(raw) - 256))  # It's at the very end
+    if not match:
+        return None
+    # Hash through a memoryview so a large backup isn't copied just to drop its tail
+    digest = new_checksum(algo, memoryview(raw)[:match.start()])
+    digest.update((match.group(1) or b'') + b'}')
+    return digest.hexdigest()
+
+
+def new_session() -> requests.Session:
+    """
+    Create a requests session with a sized keep-alive connection pool
+    
+    Retries stay in request_with_retry, so the adapter itself never retries.
+    """
+    session = requests.Session()
+    session.trust_env = False  # Disable proxy detection
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def progress_journal(progress_file: str) -> Path:
+    """Path of the append-only log of requests made since the progress file was last saved"""
+    return Path(progress_file).with_suffix('.jsonl')
+
+
+def append_progress(progress_file: str, item_id: str, entry: Dict):
+    """Record one submitted item in the progress journal straight away, so a crash can't lose it"""
+    try:
+        with open(progress_journal(progress_file), 'ab') as f:
+            f.write(serialize_json_line({'id': item_id, **entry}))
+    except Exception as e:
+        logger.warning(f"Failed to append to progress journal: {e}")
+
+
+def load_progress_journal(progress_file: str, submitted: Dict) -> int:
+    """
+    Merge items from a progress journal left behind by an interrupted restore
+    
+    Returns:
+        Number of journal entries merged into submitted
+    """
+    merged = 0
+    with open(progress_journal(progress_file), 'rb') as f:
+        for line in f:
+            try:
+                entry = parse_json(line)
+            except ValueError:
+                continue  # Partial last line from a crash mid-write
+            submitted[entry.pop('id')] = entry
+            merged += 1
+    return merged
+
+
+def save_progress(progress_file: str, progress_data: Dict) -> bool:
+    """
+    Atomically write restore progress (temp file + rename, so a crash never leaves it half-written)
+    
+    The progress journal is folded into progress_data on load, so it's removed once saved.
+    
+    Returns:
+        True if saved
+    """
+    progress_data['last_updated'] = datetime.now().isoformat()
+    progress_path = Path(progress_file)
+    tmp_path = progress_path.with_name(progress_path.name + '.tmp')
+    try:
+        progress_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(serialize_backup(progress_data))
+        os.replace(tmp_path, progress_path)
+        progress_journal(progress_file).unlink(missing_ok=True)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to save progress file: {e}")
+        return False
+
+
+def response_json(response: requests.Response):
+    """Decode a JSON response body (orjson if installed - large Plex library listings parse much faster)"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
 
 
 def request_with_retry(session, method: str, url: str, max_retries: int = MAX_RETRIES, **kwargs) -> requests.Response:
@@ -73,6 +303,7 @@ def request_with_retry(session, method: str, url: str, max_retries: int = MAX_RE
     kwargs.setdefault('timeout', REQUEST_TIMEOUT)
     
     last_exception = None
+    response = None
     for attempt in range(max_retries):
         try:
             response = getattr(session, method)(url, **kwargs)
@@ -84,6 +315,13 @@ def request_with_retry(session, method: str, url: str, max_retries: int = MAX_RE
                 time.sleep(wait)
                 continue
             
+            # Retry gateway errors, but only for reads - a POST may already have been processed
+            if response.status_code in RETRY_STATUSES and method in ('get', 'head') and attempt < max_retries - 1:
+                wait_time = 2 ** attempt
+                logger.warning(f"HTTP {response.status_code}, retrying in {wait_time}s ({attempt + 1}/{max_retries})...")
+                time.sleep(wait_time)
+                continue
+            
             return response
             
         except requests.exceptions.Timeout as e:
@@ -109,7 +347,38 @@ def request_with_retry(session, method: str, url: str, max_retries: int = MAX_RE
     # If we get here, all retries failed
     if last_exception:
         raise last_exception
-    return response
+    return response  # Still rate limited after every attempt
+
+
+class RequestPacer:
+    """Token bucket pacing requests to an average rate, allowing short bursts"""
+    
+    def __init__(self, delay: float, burst: int = 1):
+        """
+        Args:
+            delay: Average seconds between requests
+            burst: Requests that may be sent back-to-back when idle
+        """
+        self.rate = 1 / delay
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+    
+    def wait(self):
+        """Block until a request may be sent, then take a token"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+        if self.tokens < 1:
+            time.sleep((1 - self.tokens) / self.rate)
+            self.tokens = 1.0
+            self.last_refill = time.monotonic()
+        self.tokens -= 1
+    
+    def update(self, response: requests.Response):
+        """Stop bursting when the server reports it's rate limiting us"""
+        if response.status_code == 429 or response.headers.get('X-RateLimit-Remaining') == '0':
+            self.tokens = 0.0
 
 
 class PlexLibraryBackup:
@@ -123,12 +392,13 @@ class PlexLibraryBackup:
         """
         self.plex_url = plex_url.rstrip('/')
         self.plex_token = plex_token
-        self.session = requests.Session()
-        self.session.trust_env = False  # Disable proxy detection
+        self.session = new_session()
         self.session.headers.update({
             'X-Plex-Token': plex_token,
             'Accept': 'application/json'
         })
+        self._sections: Optional[Dict[str, Dict]] = None  # title -> section, filled on first use
+        self._dir_cache: Dict[str, set] = {}  # directory -> normcased entry names, see _file_exists
         
         # Verify connection
         try:
@@ -139,48 +409,115 @@ class PlexLibraryBackup:
         except requests.exceptions.RequestException as e:
             raise RuntimeError(f"Cannot reach Plex server at {plex_url}: {e}")
 
-    def get_libraries(self) -> Dict[str, str]:
+    def _get_sections(self, refresh: bool = False) -> Dict[str, Dict]:
+        """
+        Get library sections keyed by title, fetching /library/sections only once
+        
+        Args:
+            refresh: Re-fetch from Plex instead of using the cached sections
+        """
+        if self._sections is None or refresh:
+            response = request_with_retry(self.session, 'get', f'{self.plex_url}/library/sections')
+            self._sections = {
+                section['title']: section
+                for section in response_json(response)['MediaContainer']['Directory']
+            }
+        return self._sections
+
+    def get_libraries(self, refresh: bool = False) -> Dict[str, str]:
         """Get all libraries and their types"""
         try:
-            response = request_with_retry(self.session, 'get', f'{self.plex_url}/library/sections')
-            libs = {}
-            for section in response.json()['MediaContainer']['Directory']:
-                libs[section['title']] = section['type']
-            return libs
+            return {title: section['type'] for title, section in self._get_sections(refresh).items()}
         except Exception as e:
             logger.error(f"Failed to get libraries: {e}")
             return {}
 
-    def get_library_items(self, library_name: str) -> List[Dict]:
-        """Get all items from a specific library"""
+    def _get_library_page(self, url: str, params: Dict, start: int) -> Tuple[List[Dict], Optional[int]]:
+        """
+        Fetch one page of a library listing
+        
+        Returns:
+            (items, totalSize reported by Plex or None)
+        """
+        page_params = dict(params, **{'X-Plex-Container-Start': start, 'X-Plex-Container-Size': PLEX_PAGE_SIZE})
+        response = request_with_retry(self.session, 'get', url, params=page_params, timeout=60)
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        data = response_json(response).get('MediaContainer', {})
+        return data.get('Metadata', []), data.get('totalSize')
+
+    def _load_listing_cache(self, cache_file: Path, updated_at) -> Optional[List[Dict]]:
+        """Load a cached library listing if it was saved at the section's current updatedAt"""
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = parse_json(f.read())
+            if cached.get('plex_url') == self.plex_url and cached.get('updatedAt') == updated_at:
+                return cached['items']
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"  Ignoring unreadable listing cache {cache_file}: {e}")
+        return None
+
+    def _save_listing_cache(self, cache_file: Path, updated_at, items: List[Dict]):
+        """Save a library listing for _load_listing_cache (temp file + rename)"""
+        tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'wb') as f:
+                f.write(serialize_backup({'plex_url': self.plex_url, 'updatedAt': updated_at, 'items': items}, pretty=False))
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            logger.warning(f"  Failed to save listing cache: {e}")
+
+    def get_library_items(self, library_name: str, cache_dir: Optional[str] = None) -> List[Dict]:
+        """
+        Get all items from a specific library
+        
+        Args:
+            library_name: Library to list
+            cache_dir: Reuse the listing saved here while the section's updatedAt is unchanged
+        """
         try:
             # First, get the library key
-            response = request_with_retry(self.session, 'get', f'{self.plex_url}/library/sections')
-            library_key = None
-            
-            for section in response.json()['MediaContainer']['Directory']:
-                if section['title'] == library_name:
-                    library_key = section['key']
-                    break
+            section = self._get_sections().get(library_name)
+            library_key = section['key'] if section else None
             
             if not library_key:
                 logger.warning(f"Library '{library_name}' not found")
                 return []
             
-            # Get all items from the library - no pagination limit
+            cache_file = None
+            updated_at = section.get('updatedAt')
+            if cache_dir and updated_at is not None:
+                cache_file = Path(cache_dir) / f"{section.get('uuid') or library_key}.json"
+                cached = self._load_listing_cache(cache_file, updated_at)
+                if cached is not None:
+                    logger.info(f"  Loaded {len(cached)} items from listing cache (library unchanged)")
+                    return cached
+            
+            # Get all items from the library in pages, including GUIDs
             try:
                 url = f'{self.plex_url}/library/sections/{library_key}/all'
-                # Request all items at once without limit, including GUIDs
                 params = {'X-Plex-Token': self.plex_token, 'includeExternalMedia': 1, 'includeGuids': 1}
-                response = request_with_retry(self.session, 'get', url, params=params, timeout=60)
                 
-                if response.status_code != 200:
-                    logger.error(f"  HTTP {response.status_code}")
-                    all_items = []
-                else:
-                    data = response.json().get('MediaContainer', {})
-                    all_items = data.get('Metadata', [])
-                    logger.info(f"  Loaded {len(all_items)} items")
+                # The first page tells us the library size; the rest are fetched concurrently
+                all_items, total_size = self._get_library_page(url, params, 0)
+                if total_size is None:
+                    # No totalSize reported - keep paging until a short page
+                    page = all_items
+                    while len(page) == PLEX_PAGE_SIZE:
+                        page, _ = self._get_library_page(url, params, len(all_items))
+                        all_items = all_items + page
+                elif total_size > len(all_items):
+                    starts = range(len(all_items), total_size, PLEX_PAGE_SIZE)
+                    with ThreadPoolExecutor(max_workers=min(PLEX_PAGE_WORKERS, len(starts))) as pool:
+                        for page, _ in pool.map(lambda start: self._get_library_page(url, params, start), starts):
+                            all_items.extend(page)
+                
+                logger.info(f"  Loaded {len(all_items)} items")
+                if cache_file:
+                    self._save_listing_cache(cache_file, updated_at, all_items)
                     
             except requests.exceptions.Timeout:
                 logger.error(f"  Timeout loading items (request too large?)")
@@ -206,7 +543,7 @@ class PlexLibraryBackup:
                 logger.debug(f"  Failed to get seasons: HTTP {response.status_code}")
                 return []
             
-            data = response.json().get('MediaContainer', {})
+            data = response_json(response).get('MediaContainer', {})
             seasons = data.get('Metadata', [])
             return seasons
         except Exception as e:
@@ -223,7 +560,7 @@ class PlexLibraryBackup:
                 logger.debug(f"  Failed to get episodes: HTTP {response.status_code}")
                 return []
             
-            data = response.json().get('MediaContainer', {})
+            data = response_json(response).get('MediaContainer', {})
             episodes = data.get('Metadata', [])
             return episodes
         except Exception as e:
@@ -256,6 +593,15 @@ class PlexLibraryBackup:
             episodes = self.get_season_episodes(season_key)
             episodes_data = []
             
+            # Stat the whole season in one batch (one stat() per file instead of exists() + stat())
+            file_sizes = {}
+            if verify_files:
+                file_sizes = stat_files(
+                    part[0]['file']
+                    for part in (ep['Media'][0].get('Part') for ep in episodes if ep.get('Media'))
+                    if part and part[0].get('file')
+                )
+            
             for ep in episodes:
                 ep_num = ep.get('index', 0)
                 ep_title = ep.get('title', f'Episode {ep_num}')
@@ -276,19 +622,18 @@ class PlexLibraryBackup:
                             ep_data['file_path'] = file_path
                             
                             if file_path:
-                                try:
-                                    path = Path(file_path)
-                                    if path.exists():
-                                        size_mb = path.stat().st_size / (1024 * 1024)
-                                        ep_data['file_exists'] = True
-                                        ep_data['file_size_mb'] = round(size_mb, 1)
-                                        verified_episodes += 1
-                                    else:
-                                        ep_data['file_exists'] = False
-                                        missing_episodes += 1
-                                except Exception as e:
+                                size = file_sizes.get(file_path)
+                                if isinstance(size, OSError):
+                                    ep_data['file_exists'] = False
+                                    ep_data['error'] = str(size)
+                                    missing_episodes += 1
+                                elif size is not None:
+                                    size_mb = size / (1024 * 1024)
+                                    ep_data['file_exists'] = True
+                                    ep_data['file_size_mb'] = round(size_mb, 1)
+                                    verified_episodes += 1
+                                else:
                                     ep_data['file_exists'] = False
-                                    ep_data['error'] = str(e)
                                     missing_episodes += 1
                             else:
                                 ep_data['file_exists'] = False
@@ -318,10 +663,52 @@ class PlexLibraryBackup:
             'missing_episodes': missing_episodes
         }
 
-    def verify_file_exists(self, item: Dict) -> Tuple[bool, str, str]:
+    def stat_library_files(self, items: List[Dict]) -> Dict[str, object]:
+        """
+        Stat every movie file in a library concurrently
+        
+        Returns:
+            Dict of file path -> stat_file_size() result, for verify_file_exists
+        """
+        paths = []
+        for item in items:
+            if item.get('type') != 'movie':
+                continue
+            try:
+                file_path = item['Media'][0]['Part'][0].get('file', '')
+            except (KeyError, IndexError, TypeError):
+                continue
+            if file_path:
+                paths.append(file_path)
+        
+        return stat_files(paths)
+
+    def _file_exists(self, file_path: str) -> bool:
+        """
+        Check a file exists using a cached listing of its directory
+        
+        Episodes share season folders, so one scandir() per directory replaces a
+        stat() per file - each of which is a round-trip on a network share.
+        """
+        parent, name = os.path.split(file_path)
+        listing = self._dir_cache.get(parent)
+        if listing is None:
+            try:
+                with os.scandir(parent or os.curdir) as entries:
+                    listing = {os.path.normcase(entry.name) for entry in entries}
+            except OSError:
+                listing = set()
+            self._dir_cache[parent] = listing
+        return os.path.normcase(name) in listing
+
+    def verify_file_exists(self, item: Dict, file_sizes: Dict[str, object] = None) -> Tuple[bool, str, str]:
         """
         Verify that the file exists at the location Plex reports
         
+        Args:
+            item: Plex metadata item
+            file_sizes: Optional results from stat_library_files (paths not in it are stat'd here)
+        
         Returns:
             (exists: bool, file_path: str, reason: str)
         """
@@ -349,9 +736,15 @@ class PlexLibraryBackup:
             if not file_path:
                 return False, "", "No file path in metadata"
             
-            path = Path(file_path)
-            if path.exists():
-                size_mb = path.stat().st_size / (1024 * 1024)
+            if file_sizes is not None and file_path in file_sizes:
+                size = file_sizes[file_path]
+            else:
+                size = stat_file_size(file_path)
+            
+            if isinstance(size, OSError):
+                raise size
+            if size is not None:
+                size_mb = size / (1024 * 1024)
                 return True, file_path, f"OK ({size_mb:.1f} MB)"
             else:
                 return False, file_path, "File not found on disk"
@@ -359,9 +752,130 @@ class PlexLibraryBackup:
         except Exception as e:
             return False, "", f"Error checking file: {e}"
 
+    def _export_one_library(self, lib_name: str, verify_files: bool,
+                            detailed_episodes: bool,
+                            listing_cache: Optional[str] = None) -> Tuple[List[Dict], Dict]:
+        """
+        Export a single library
+        
+        Returns:
+            (library_backup: list of item dicts, stats: counters to add to the export totals)
+        """
+        counts = [0] * len(EXPORT_STATS)  # Indexed by the STAT_* constants (cheaper than dict updates per item)
+        
+        logger.info(f"Exporting library: {lib_name}")
+        items = self.get_library_items(lib_name, cache_dir=listing_cache)
+        
+        # Stat movie files up front in parallel; each stat is a round-trip on a NAS
+        file_sizes = self.stat_library_files(items) if verify_files else None
+        
+        library_backup = []
+        
+        # Pop items as they're processed so each raw Plex item (with all its Media/Part
+        # metadata) is freed once projected, instead of the whole listing living to the end
+        items.reverse()
+        while items:
+            item = items.pop()
+            try:
+                try:
+                    title, item_type, year, rating_key = ITEM_FIELDS(item)
+                except KeyError:
+                    # Not every item has every field (e.g. no year)
+                    title = item.get('title', 'Unknown')
+                    item_type = item.get('type', 'unknown')
+                    year = item.get('year')
+                    rating_key = item.get('ratingKey')
+                
+                item_data = {
+                    'title': title,
+                    'type': item_type,
+                    'year': year,
+                    'ratingKey': rating_key,
+                }
+                
+                # Track item types
+                if item_type == 'movie':
+                    counts[STAT_MOVIES] += 1
+                elif item_type == 'show':
+                    counts[STAT_SHOWS] += 1
+                
+                # Extract external IDs for Overseerr restore
+                for guid in item.get('Guid', ()):
+                    match = GUID_ID.match(guid.get('id', ''))
+                    if match:
+                        item_data[f'{match.group(1)}_id'] = match.group(2)
+                
+                # Debug logging for items without TMDB ID
+                if 'tmdb_id' not in item_data and item_type == 'movie':
+                    logger.debug("Debug: %s - Guid field: %s", title, item.get('Guid', 'NO GUID'))
+                
+                if item_type == 'show':
+                    leaf_count = item.get('leafCount', 0)
+                    item_data['seasons'] = item.get('childCount', 0)  # Number of seasons
+                    item_data['episodes'] = leaf_count  # Total episodes
+                    
+                    # Detailed episode backup if requested
+                    if detailed_episodes:
+                        logger.info(f"    Fetching episode details for: {title}")
+                        episode_details = self.get_episode_details(
+                            rating_key,
+                            verify_files=verify_files
+                        )
+                        item_data['season_details'] = episode_details['seasons']
+                        item_data['detailed'] = True
+                        
+                        counts[STAT_EPISODES] += episode_details['total_episodes']
+                        counts[STAT_VERIFIED_ITEMS] += episode_details['verified_episodes']
+                        counts[STAT_MISSING_EPISODES] += episode_details['missing_episodes']
+                        
+                        if episode_details['missing_episodes'] > 0:
+                            logger.info(f"      Missing {episode_details['missing_episodes']}/{episode_details['total_episodes']} episodes")
+                    else:
+                        # Standard mode - just mark TV shows as existing if they have episodes
+                        if verify_files:
+                            if leaf_count > 0:
+                                item_data['file_exists'] = True
+                                item_data['file_status'] = f"OK ({leaf_count} episodes)"
+                                counts[STAT_VERIFIED_ITEMS] += 1
+                            else:
+                                item_data['file_exists'] = False
+                                item_data['file_status'] = "No episodes found"
+                                counts[STAT_MISSING_FILES] += 1
+                
+                elif item_type == 'movie':
+                    item_data['duration'] = item.get('duration')
+                    item_data['contentRating'] = item.get('contentRating')
+                    
+                    file_verified = True
+                    if verify_files:
+                        exists, file_path, reason = self.verify_file_exists(item, file_sizes)
+                        item_data['file_path'] = file_path
+                        item_data['file_exists'] = exists
+                        item_data['file_status'] = reason
+                        
+                        if exists:
+                            counts[STAT_VERIFIED_ITEMS] += 1
+                        else:
+                            counts[STAT_MISSING_FILES] += 1
+                            file_verified = False
+                    
+                    status_icon = "[OK]" if file_verified else "✗"
+                    logger.debug("  %s %s (%s)", status_icon, title, item_type)
+                
+                library_backup.append(item_data)
+                counts[STAT_TOTAL_ITEMS] += 1
+            
+            except Exception as e:
+                logger.error(f"  [FAIL] Error processing item: {e}")
+                counts[STAT_ERRORS] += 1
+                continue
+        
+        return library_backup, dict(zip(EXPORT_STATS, counts))
+
     def export_library(self, library_names: List[str], output_file: str, 
                       verify_files: bool = True, skip_libraries: List[str] = None,
-                      detailed_episodes: bool = False) -> Dict:
+                      detailed_episodes: bool = False, workers: int = LIBRARY_WORKERS,
+                      pretty: bool = False, listing_cache: Optional[str] = None) -> Dict:
         """
         Export library to JSON backup file
         
@@ -371,135 +885,50 @@ class PlexLibraryBackup:
             verify_files: Check if files exist on disk
             skip_libraries: Libraries to skip
             detailed_episodes: If True, fetch individual episode details for TV shows (slower)
+            workers: Libraries to export concurrently, so one library's Plex fetch
+                     overlaps with another's file verification
+            pretty: Indent the JSON for reading (compact is smaller and faster to write)
+            listing_cache: Directory to cache Plex library listings in, reused while a
+                           library's updatedAt is unchanged (file checks still run)
         """
         if skip_libraries is None:
             skip_libraries = []
         
-        stats = {
-            'total_items': 0,
-            'verified_items': 0,
-            'missing_files': 0,
-            'errors': 0,
-            'movies': 0,
-            'shows': 0,
-            'episodes': 0,
-            'missing_episodes': 0
-        }
+        stats = dict.fromkeys(EXPORT_STATS, 0)
         
         if not library_names:
             all_libs = self.get_libraries()
             library_names = list(all_libs.keys())
             logger.info(f"No libraries specified, exporting all: {', '.join(library_names)}")
         
-        libraries_data = {}
-        
+        libraries_to_export = []
         for lib_name in library_names:
             # Skip if in skip list
             if lib_name in skip_libraries:
                 logger.info(f"Skipping library (in skip list): {lib_name}")
                 continue
-            
-            logger.info(f"Exporting library: {lib_name}")
-            items = self.get_library_items(lib_name)
-            
-            library_backup = []
-            
-            for item in items:
-                try:
-                    item_data = {
-                        'title': item.get('title', 'Unknown'),
-                        'type': item.get('type', 'unknown'),
-                        'year': item.get('year'),
-                        'ratingKey': item.get('ratingKey'),
-                    }
-                    
-                    # Track item types
-                    if item.get('type') == 'movie':
-                        stats['movies'] += 1
-                    elif item.get('type') == 'show':
-                        stats['shows'] += 1
-                    
-                    # Extract external IDs for Overseerr restore
-                    if 'Guid' in item:
-                        for guid in item['Guid']:
-                            guid_id = guid.get('id', '')
-                            if 'tmdb' in guid_id:
-                                item_data['tmdb_id'] = guid_id.split('/')[-1]
-                            elif 'tvdb' in guid_id:
-                                item_data['tvdb_id'] = guid_id.split('/')[-1]
-                    
-                    # Debug logging for items without TMDB ID
-                    if 'tmdb_id' not in item_data and item.get('type') == 'movie':
-                        logger.debug(f"Debug: {item['title']} - Guid field: {item.get('Guid', 'NO GUID')}")
-                    
-                    if item.get('type') == 'show':
-                        item_data['seasons'] = item.get('childCount', 0)  # Number of seasons
-                        item_data['episodes'] = item.get('leafCount', 0)  # Total episodes
-                        
-                        # Detailed episode backup if requested
-                        if detailed_episodes:
-                            logger.info(f"    Fetching episode details for: {item['title']}")
-                            episode_details = self.get_episode_details(
-                                item.get('ratingKey'),
-                                verify_files=verify_files
-                            )
-                            item_data['season_details'] = episode_details['seasons']
-                            item_data['detailed'] = True
-                            
-                            stats['episodes'] += episode_details['total_episodes']
-                            stats['verified_items'] += episode_details['verified_episodes']
-                            stats['missing_episodes'] += episode_details['missing_episodes']
-                            
-                            if episode_details['missing_episodes'] > 0:
-                                logger.info(f"      Missing {episode_details['missing_episodes']}/{episode_details['total_episodes']} episodes")
-                        else:
-                            # Standard mode - just mark TV shows as existing if they have episodes
-                            if verify_files:
-                                if item.get('leafCount', 0) > 0:
-                                    item_data['file_exists'] = True
-                                    item_data['file_status'] = f"OK ({item.get('leafCount', 0)} episodes)"
-                                    stats['verified_items'] += 1
-                                else:
-                                    item_data['file_exists'] = False
-                                    item_data['file_status'] = "No episodes found"
-                                    stats['missing_files'] += 1
-                    
-                    elif item.get('type') == 'movie':
-                        item_data['duration'] = item.get('duration')
-                        item_data['contentRating'] = item.get('contentRating')
-                        
-                        file_verified = True
-                        if verify_files:
-                            exists, file_path, reason = self.verify_file_exists(item)
-                            item_data['file_path'] = file_path
-                            item_data['file_exists'] = exists
-                            item_data['file_status'] = reason
-                            
-                            if exists:
-                                stats['verified_items'] += 1
-                            else:
-                                stats['missing_files'] += 1
-                                file_verified = False
-                        
-                        status_icon = "[OK]" if file_verified else "✗"
-                        logger.debug(f"  {status_icon} {item_data['title']} ({item_data['type']})")
-                    
-                    library_backup.append(item_data)
-                    stats['total_items'] += 1
-                
-                except Exception as e:
-                    logger.error(f"  [FAIL] Error processing item: {e}")
-                    stats['errors'] += 1
-                    continue
-            
-            libraries_data[lib_name] = library_backup
+            libraries_to_export.append(lib_name)
+        
+        # Libraries are independent and mostly wait on Plex and disk, so export them concurrently
+        libraries_data = {}
+        if libraries_to_export:
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(libraries_to_export)))) as pool:
+                results = pool.map(
+                    lambda lib_name: self._export_one_library(lib_name, verify_files, detailed_episodes, listing_cache),
+                    libraries_to_export
+                )
+                for lib_name, (library_backup, lib_stats) in zip(libraries_to_export, results):
+                    libraries_data[lib_name] = library_backup
+                    for key, value in lib_stats.items():
+                        stats[key] += value
         
         # Build backup data with stats
         backup_data = {
             'exported_at': datetime.now().isoformat(),
             'plex_url': self.plex_url,
-            'version': '1.2',
+            'version': '1.3',
             'detailed_episodes': detailed_episodes,
+            'checksum_algo': CHECKSUM_ALGORITHM,
             'stats': {
                 'total_items': stats['total_items'],
                 'movies': stats['movies'],
@@ -517,19 +946,32 @@ class PlexLibraryBackup:
             output_path = Path(output_file)
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, indent=2)
+            payload = serialize_backup(backup_data, pretty=pretty)
             
-            # Calculate and add checksum
-            checksum = calculate_checksum(output_path)
+            # Write gzip directly when asked for a .gz file, rather than compressing afterwards
+            if output_path.suffix == '.gz':
+                out = gzip.open(output_path, 'wb', compresslevel=BACKUP_GZIP_LEVEL)
+            else:
+                out = open(output_path, 'wb')
+            
+            # Hash the payload in the background while it's compressed/written; hashlib
+            # and zlib both release the GIL on large buffers
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                hashing = pool.submit(lambda: new_checksum(CHECKSUM_ALGORITHM, payload).hexdigest())
+                with out as f:
+                    # Splice the checksum in as the last key instead of serializing again
+                    if pretty:
+                        f.write(memoryview(payload)[:-2])
+                        checksum = hashing.result()
+                        f.write(f',\n  "checksum": "{checksum}"\n}}'.encode('utf-8'))
+                    else:
+                        f.write(memoryview(payload)[:-1])
+                        checksum = hashing.result()
+                        f.write(f',"checksum":"{checksum}"}}'.encode('utf-8'))
             backup_data['checksum'] = checksum
             
-            # Rewrite with checksum included
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, indent=2)
-            
             logger.info(f"[OK] Backup saved to: {output_path}")
-            logger.info(f"[OK] Checksum (SHA256): {checksum[:16]}...")
+            logger.info(f"[OK] Checksum ({CHECKSUM_ALGORITHM.upper()}): {checksum[:16]}...")
             return stats
         
         except Exception as e:
@@ -572,7 +1014,7 @@ class PlexLibraryBackup:
                 logger.warning(f"    Failed to look up '{title}' in Overseerr: HTTP {response.status_code}")
                 return False
             
-            data = response.json()
+            data = response_json(response)
             media_info = data.get('mediaInfo')
             
             if not media_info:
@@ -636,7 +1078,7 @@ class PlexLibraryBackup:
                 logger.warning(f"    Failed to query Radarr: HTTP {response.status_code}")
                 return False
             
-            movies = response.json()
+            movies = response_json(response)
             
             # Find movie by TMDB ID
             movie_entry = None
@@ -716,7 +1158,7 @@ class PlexLibraryBackup:
                 logger.warning(f"    Failed to query Sonarr: HTTP {response.status_code}")
                 return False
             
-            series_list = response.json()
+            series_list = response_json(response)
             
             # Find series by TVDB ID
             series_entry = None
@@ -775,6 +1217,44 @@ class PlexLibraryBackup:
             logger.error(f"    Error processing '{title}' in Sonarr: {e}")
             return False
 
+    def _fetch_episode_counts(self, plex_session, plex_url: str, rating_keys: List[str]) -> Dict[str, int]:
+        """Fetch one bulk /library/metadata batch for get_show_episode_counts"""
+        try:
+            url = f'{plex_url}/library/metadata/{",".join(rating_keys)}'
+            response = request_with_retry(plex_session, 'get', url, timeout=30)
+            if response.status_code != 200:
+                logger.debug(f"  Show metadata query returned HTTP {response.status_code}")
+                return {}
+            # Shows missing from a good response have no episodes now
+            counts = dict.fromkeys(rating_keys, 0)
+            for metadata in response_json(response).get('MediaContainer', {}).get('Metadata', []):
+                counts[str(metadata.get('ratingKey'))] = metadata.get('leafCount', 0)
+            return counts
+        except Exception as e:
+            logger.debug(f"  Error querying show metadata: {e}")
+            return {}
+
+    def get_show_episode_counts(self, plex_session, plex_url: str, rating_keys: List[str]) -> Dict[str, int]:
+        """
+        Get current episode counts for many shows with bulk /library/metadata/{k1,k2,...} requests
+        
+        Returns:
+            Dict of ratingKey -> leafCount. Keys whose batch failed to load are left
+            out so callers can assume the show is OK, as for a single failed query.
+        """
+        chunks = [rating_keys[i:i + PLEX_METADATA_BATCH] for i in range(0, len(rating_keys), PLEX_METADATA_BATCH)]
+        counts = {}
+        if not chunks:
+            return counts
+        
+        # Batches are independent, so keep a few in flight at once
+        with ThreadPoolExecutor(max_workers=min(PLEX_METADATA_WORKERS, len(chunks))) as pool:
+            for chunk_counts in pool.map(
+                lambda chunk: self._fetch_episode_counts(plex_session, plex_url, chunk), chunks
+            ):
+                counts.update(chunk_counts)
+        return counts
+
     def restore_to_overseerr(self, backup_file: str, overseerr_url: str, 
                             overseerr_token: str, plex_url: str, plex_token: str,
                             batch_limit: Optional[int] = None, 
@@ -784,7 +1264,9 @@ class PlexLibraryBackup:
                             radarr_url: Optional[str] = None,
                             radarr_token: Optional[str] = None,
                             sonarr_url: Optional[str] = None,
-                            sonarr_token: Optional[str] = None) -> Dict:
+                            sonarr_token: Optional[str] = None,
+                            request_delay: float = OVERSEERR_DELAY,
+                            request_burst: int = OVERSEERR_BURST) -> Dict:
         """
         Restore backup to Overseerr by creating requests for MISSING files only
         Re-verifies files exist before submitting to avoid false requests
@@ -795,18 +1277,20 @@ class PlexLibraryBackup:
             force: If True, clear existing media data from Overseerr before requesting.
                    This allows re-requesting content that Overseerr thinks is already available.
                    Useful when Overseerr's cache is stale or files were deleted.
+            request_delay: Average seconds between Overseerr requests (0 = no pacing)
+            request_burst: Overseerr requests allowed back-to-back before pacing applies
         """
-        import gzip
-        
         try:
             backup_path = Path(backup_file)
             # Handle both .json and .json.gz files
-            if backup_path.suffix == '.gz' or str(backup_path).endswith('.json.gz'):
-                with gzip.open(backup_file, 'rt', encoding='utf-8') as f:
-                    backup_data = json.load(f)
+            if backup_path.suffix == '.gz':
+                # One read and one C-level inflate instead of GzipFile's small chunked reads
+                with open(backup_file, 'rb') as f:
+                    raw = gzip.decompress(f.read())
             else:
-                with open(backup_file, 'r', encoding='utf-8') as f:
-                    backup_data = json.load(f)
+                with open(backup_file, 'rb') as f:
+                    raw = f.read()
+            backup_data = parse_json(raw)
         except Exception as e:
             logger.error(f"Failed to load backup: {e}")
             return {}
@@ -814,31 +1298,30 @@ class PlexLibraryBackup:
         # Verify backup integrity if checksum exists
         if 'checksum' in backup_data:
             stored_checksum = backup_data['checksum']
-            # Remove checksum for verification
-            backup_copy = backup_data.copy()
-            del backup_copy['checksum']
+            checksum_algo = backup_data.get('checksum_algo', LEGACY_CHECKSUM_ALGORITHM)
+            calculated_checksum = backup_content_checksum(raw, checksum_algo)
             
-            # Write temp file to verify
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as tmp:
-                json.dump(backup_copy, tmp, indent=2)
-                tmp_path = tmp.name
-            
-            calculated_checksum = calculate_checksum(tmp_path)
-            os.unlink(tmp_path)
+            if calculated_checksum is None:
+                # Checksum isn't the last key (e.g. hand-edited file) - re-serialize without it
+                backup_copy = backup_data.copy()
+                del backup_copy['checksum']
+                calculated_checksum = new_checksum(
+                    checksum_algo, json.dumps(backup_copy, indent=2).encode('utf-8')
+                ).hexdigest()
             
             if calculated_checksum != stored_checksum:
                 logger.warning(f"Backup checksum mismatch! File may be corrupted.")
                 logger.warning(f"  Expected: {stored_checksum[:16]}...")
                 logger.warning(f"  Got:      {calculated_checksum[:16]}...")
+        del raw
         
         progress_data = {}
         if progress_file:
             progress_path = Path(progress_file)
             if progress_path.exists():
                 try:
-                    with open(progress_path, 'r', encoding='utf-8') as f:
-                        progress_data = json.load(f)
+                    with open(progress_path, 'rb') as f:
+                        progress_data = parse_json(f.read())
                     # Only use submitted items if they exist
                     if 'submitted' in progress_data:
                         logger.info(f"Loaded {len(progress_data['submitted'])} previously submitted items")
@@ -846,10 +1329,18 @@ class PlexLibraryBackup:
                         logger.info("Progress file is empty, starting fresh")
                 except Exception as e:
                     logger.warning(f"Could not load progress file: {e}")
+            
+            if progress_journal(progress_file).exists():
+                try:
+                    recovered = load_progress_journal(progress_file, progress_data.setdefault('submitted', {}))
+                    logger.info(f"Recovered {recovered} submitted items from interrupted batch")
+                    # Fold it into the progress file so new entries start on a fresh journal
+                    save_progress(progress_file, progress_data)
+                except Exception as e:
+                    logger.warning(f"Could not load progress journal: {e}")
         
         overseerr_url = overseerr_url.rstrip('/')
-        overseerr_session = requests.Session()
-        overseerr_session.trust_env = False
+        overseerr_session = new_session()
         overseerr_session.headers.update({
             'X-Api-Key': overseerr_token,
             'Content-Type': 'application/json'
@@ -858,8 +1349,7 @@ class PlexLibraryBackup:
         
         logger.info(f"[OK] Configured Overseerr session for {overseerr_url}")
         
-        plex_session = requests.Session()
-        plex_session.trust_env = False
+        plex_session = new_session()
         plex_session.headers.update({
             'X-Plex-Token': plex_token,
             'Accept': 'application/json'
@@ -869,8 +1359,7 @@ class PlexLibraryBackup:
         radarr_session = None
         if radarr_url and radarr_token:
             radarr_url = radarr_url.rstrip('/')
-            radarr_session = requests.Session()
-            radarr_session.trust_env = False
+            radarr_session = new_session()
             radarr_session.headers.update({
                 'X-Api-Key': radarr_token,
                 'Content-Type': 'application/json'
@@ -882,8 +1371,7 @@ class PlexLibraryBackup:
         sonarr_session = None
         if sonarr_url and sonarr_token:
             sonarr_url = sonarr_url.rstrip('/')
-            sonarr_session = requests.Session()
-            sonarr_session.trust_env = False
+            sonarr_session = new_session()
             sonarr_session.headers.update({
                 'X-Api-Key': sonarr_token,
                 'Content-Type': 'application/json'
@@ -912,8 +1400,22 @@ class PlexLibraryBackup:
                 logger.info("  Sonarr integration: ENABLED - will trigger searches for missing episodes")
         
         logger.info("Restoring to Overseerr (only missing files)...")
+        self._dir_cache = {}  # Don't trust listings from an earlier restore
+        
+        # Current episode counts for standard-mode shows, fetched in bulk rather than per show
+        submitted = progress_data.setdefault('submitted', {})
+        show_keys = [
+            str(item['ratingKey'])
+            for lib_name, items in backup_data['libraries'].items()
+            for item in items
+            if item['type'] == 'show' and item.get('episodes', 0) > 0
+            and not (item.get('detailed') and 'season_details' in item)
+            and f"{lib_name}:{item['ratingKey']}" not in submitted
+        ]
+        current_episodes_map = self.get_show_episode_counts(plex_session, plex_url, show_keys)
         
         requests_created_this_batch = 0
+        pacer = RequestPacer(request_delay, max(1, request_burst)) if request_delay > 0 else None
         
         for lib_name, items in backup_data['libraries'].items():
             logger.info(f"Processing library: {lib_name}")
@@ -921,8 +1423,8 @@ class PlexLibraryBackup:
             for item in items:
                 # Skip if already submitted
                 item_id = f"{lib_name}:{item['ratingKey']}"
-                if item_id in progress_data.get('submitted', {}):
-                    logger.debug(f"  [SKIP] '{item['title']}' (already submitted)")
+                if item_id in submitted:
+                    logger.debug("  [SKIP] '%s' (already submitted)", item['title'])
                     stats['requests_skipped'] += 1
                     continue
                 
@@ -933,14 +1435,14 @@ class PlexLibraryBackup:
                     
                     if backed_up_episodes == 0:
                         # No episodes in backup, skip
-                        logger.debug(f"  [OK] '{item['title']}' (0 episodes in backup)")
+                        logger.debug("  [OK] '%s' (0 episodes in backup)", item['title'])
                         stats['already_exist'] += 1
                         continue
                     
                     # Check if we have detailed episode data
                     if item.get('detailed') and 'season_details' in item:
                         # Detailed mode - check individual episodes
-                        logger.debug(f"  Checking detailed episode data for '{item['title']}'")
+                        logger.debug("  Checking detailed episode data for '%s'", item['title'])
                         
                         for season in item['season_details']:
                             season_num = season.get('season_num', 0)
@@ -951,11 +1453,7 @@ class PlexLibraryBackup:
                                 file_path = ep.get('file_path', '')
                                 
                                 if file_path:
-                                    try:
-                                        if not Path(file_path).exists():
-                                            season_missing = True
-                                            missing_ep_count += 1
-                                    except:
+                                    if not self._file_exists(file_path):
                                         season_missing = True
                                         missing_ep_count += 1
                                 elif not ep.get('file_exists', True):
@@ -964,10 +1462,10 @@ class PlexLibraryBackup:
                             
                             if season_missing and season_num > 0:  # Skip specials (season 0)
                                 missing_seasons.append(season_num)
-                                logger.debug(f"    Season {season_num}: {missing_ep_count} episode(s) missing")
+                                logger.debug("    Season %s: %s episode(s) missing", season_num, missing_ep_count)
                         
                         if not missing_seasons:
-                            logger.debug(f"  [OK] '{item['title']}' (all episodes exist)")
+                            logger.debug("  [OK] '%s' (all episodes exist)", item['title'])
                             stats['already_exist'] += 1
                             continue
                         
@@ -976,48 +1474,33 @@ class PlexLibraryBackup:
                     
                     else:
                         # Standard mode - compare episode counts
-                        current_episodes = 0
-                        try:
-                            url = f'{plex_url}/library/metadata/{item["ratingKey"]}'
-                            response = request_with_retry(plex_session, 'get', url, timeout=10)
-                            if response.status_code == 200:
-                                data = response.json()
-                                metadata = data.get('MediaContainer', {}).get('Metadata', [])
-                                if metadata:
-                                    current_episodes = metadata[0].get('leafCount', 0)
-                        except Exception as e:
-                            logger.debug(f"  Error querying {item['title']}: {e}")
-                            current_episodes = backed_up_episodes  # Assume OK if can't query
+                        # Assume OK if it couldn't be queried
+                        current_episodes = current_episodes_map.get(str(item['ratingKey']), backed_up_episodes)
                         
                         # Only submit if episodes are actually missing
                         if current_episodes >= backed_up_episodes:
-                            logger.debug(f"  [OK] '{item['title']}' ({current_episodes}/{backed_up_episodes} episodes)")
+                            logger.debug("  [OK] '%s' (%s/%s episodes)", item['title'], current_episodes, backed_up_episodes)
                             stats['already_exist'] += 1
                             continue
                         
                         # Episodes are missing
-                        logger.debug(f"  Missing: '{item['title']}' ({current_episodes}/{backed_up_episodes} episodes)")
+                        logger.debug("  Missing: '%s' (%s/%s episodes)", item['title'], current_episodes, backed_up_episodes)
                         stats['total_missing'] += 1
                     # Continue to submission below
                 
                 # For movies: check if file exists on disk
                 elif item['type'] == 'movie':
-                    file_exists_now = False
-                    if 'file_path' in item and item['file_path']:
-                        try:
-                            path = Path(item['file_path'])
-                            file_exists_now = path.exists()
-                        except Exception as e:
-                            logger.debug(f"  Error checking file: {e}")
+                    file_path = item.get('file_path')
+                    file_exists_now = bool(file_path) and self._file_exists(file_path)
                     
                     # Skip if file actually exists on disk
                     if file_exists_now:
-                        logger.debug(f"  [OK] '{item['title']}' (file exists)")
+                        logger.debug("  [OK] '%s' (file exists)", item['title'])
                         stats['already_exist'] += 1
                         continue
                     
                     # Movie file is missing - mark for restoration
-                    logger.debug(f"  Missing: {item['title']}")
+                    logger.debug("  Missing: %s", item['title'])
                     stats['total_missing'] += 1
                 
                 else:
@@ -1108,6 +1591,11 @@ class PlexLibraryBackup:
                         stats['requests_skipped'] += 1
                         continue
                     
+                    # Rate limiting - time spent on the re-verification and force-clear
+                    # work above counts towards the wait
+                    if pacer:
+                        pacer.wait()
+                    
                     response = request_with_retry(
                         overseerr_session, 'post',
                         f'{overseerr_url}/api/v1/request',
@@ -1118,20 +1606,16 @@ class PlexLibraryBackup:
                     if response.status_code == 403 and 'csrf' in response.text.lower():
                         logger.debug(f"  CSRF error detected, retrying with bypass headers...")
                         
-                        # Try with X-CSRF-Token header
-                        retry_session = requests.Session()
-                        retry_session.trust_env = False
-                        retry_session.headers.update(overseerr_session.headers)
-                        retry_session.headers['X-CSRF-Token'] = 'none'
-                        retry_session.headers['X-Requested-With'] = 'XMLHttpRequest'
-                        retry_session.verify = False
-                        
+                        # Try with X-CSRF-Token header (on the same session, reusing its connection)
                         response = request_with_retry(
-                            retry_session, 'post',
+                            overseerr_session, 'post',
                             f'{overseerr_url}/api/v1/request',
-                            json=request_data
+                            json=request_data,
+                            headers={'X-CSRF-Token': 'none', 'X-Requested-With': 'XMLHttpRequest'}
                         )
                     
+                    if pacer:
+                        pacer.update(response)
                     logger.info(f"  Response: {response.status_code}")
                     
                     # Log 500 errors in detail
@@ -1149,16 +1633,13 @@ class PlexLibraryBackup:
                         requests_created_this_batch += 1
                         
                         if progress_file:
-                            if 'submitted' not in progress_data:
-                                progress_data['submitted'] = {}
-                            progress_data['submitted'][item_id] = {
+                            submitted[item_id] = {
                                 'title': item['title'],
                                 'type': item['type'],
                                 'submitted_at': datetime.now().isoformat()
                             }
-                        
-                        # Rate limiting delay
-                        time.sleep(OVERSEERR_DELAY)
+                            # Journal it now so an interrupted batch doesn't resubmit its requests
+                            append_progress(progress_file, item_id, submitted[item_id])
                     else:
                         logger.warning(f"  Failed to submit '{item['title']}' - HTTP {response.status_code}")
                         stats['requests_skipped'] += 1
@@ -1170,21 +1651,84 @@ class PlexLibraryBackup:
             if stats['batch_limit_reached']:
                 break
         
-        if progress_file:
-            progress_data['last_updated'] = datetime.now().isoformat()
-            progress_path = Path(progress_file)
-            progress_path.parent.mkdir(parents=True, exist_ok=True)
-            try:
-                with open(progress_path, 'w', encoding='utf-8') as f:
-                    json.dump(progress_data, f, indent=2)
-                logger.info(f"Progress saved to: {progress_file}")
-            except Exception as e:
-                logger.error(f"Failed to save progress file: {e}")
+        if progress_file and save_progress(progress_file, progress_data):
+            logger.info(f"Progress saved to: {progress_file}")
         
         logger.info(f"Restore batch complete!")
         return stats
 
 
+def log_export_stats(stats: Dict):
+    """Log the summary returned by export_library"""
+    logger.info("=" * 60)
+    logger.info("Export Statistics:")
+    logger.info(f"  Total items: {stats['total_items']}")
+    logger.info(f"  Movies: {stats['movies']}")
+    logger.info(f"  TV Shows: {stats['shows']}")
+    if stats.get('episodes', 0) > 0:
+        logger.info(f"  Episodes tracked: {stats['episodes']}")
+        logger.info(f"  Missing episodes: {stats.get('missing_episodes', 0)}")
+    logger.info(f"  Verified (files exist): {stats['verified_items']}")
+    logger.info(f"  Missing files: {stats['missing_files']}")
+    logger.info(f"  Errors: {stats['errors']}")
+    logger.info("=" * 60)
+
+
+def run_export(plex_url: str, plex_token: str, export_path: str,
+               libraries: Optional[List[str]] = None,
+               skip_libraries: Optional[List[str]] = None,
+               verify_files: bool = True,
+               detailed_episodes: bool = False,
+               workers: int = LIBRARY_WORKERS,
+               pretty: bool = False,
+               listing_cache: Optional[str] = None) -> Dict:
+    """
+    Connect to Plex and export libraries to a backup file
+    
+    Same as running this script with --export, for callers that import the
+    module instead of spawning it (e.g. backup_scheduler.py).
+    
+    Args:
+        plex_url: Plex server URL
+        plex_token: Plex API token
+        export_path: Path to save backup JSON
+        libraries: Library names to export (None/empty = all)
+        skip_libraries: Libraries to skip (default: DEFAULT_SKIP_LIBRARIES)
+        verify_files: Check if files exist on disk
+        detailed_episodes: Fetch individual episode details for TV shows
+        workers: Libraries to export concurrently
+        pretty: Write indented JSON instead of compact
+        listing_cache: Directory for cached Plex library listings
+    
+    Returns:
+        Export stats dict
+    
+    Raises:
+        RuntimeError: If the Plex server can't be reached
+    """
+    if skip_libraries is None:
+        skip_libraries = DEFAULT_SKIP_LIBRARIES
+    
+    plex = PlexLibraryBackup(plex_url, plex_token)
+    
+    logger.info(f"Exporting to: {export_path}")
+    if detailed_episodes:
+        logger.info("Detailed episode mode enabled - this will take longer")
+    
+    stats = plex.export_library(
+        libraries,
+        export_path,
+        verify_files=verify_files,
+        skip_libraries=skip_libraries,
+        detailed_episodes=detailed_episodes,
+        workers=workers,
+        pretty=pretty,
+        listing_cache=listing_cache
+    )
+    log_export_stats(stats)
+    return stats
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Backup Plex library and optionally restore to Overseerr'
@@ -1193,7 +1737,7 @@ def main():
     parser.add_argument('--plex-url', required=True, help='Plex server URL')
     parser.add_argument('--plex-token', required=True, help='Plex API token')
     parser.add_argument('--export', help='Export libraries to JSON file')
-    parser.add_argument('--import', help='Restore from backup JSON file')
+    parser.add_argument('--import', dest='import_file', help='Restore from backup JSON file')
     parser.add_argument('--overseerr-url', help='Overseerr server URL')
     parser.add_argument('--overseerr-token', help='Overseerr API token')
     parser.add_argument('--radarr-url', help='Radarr server URL (for force mode)')
@@ -1201,16 +1745,26 @@ def main():
     parser.add_argument('--sonarr-url', help='Sonarr server URL (for force mode)')
     parser.add_argument('--sonarr-token', help='Sonarr API token (for force mode)')
     parser.add_argument('--libraries', nargs='+', help='Specific libraries to export')
-    parser.add_argument('--skip-libraries', nargs='+', default=['AudioBooks', "Mike's Audio Books"],
+    parser.add_argument('--skip-libraries', nargs='+', default=DEFAULT_SKIP_LIBRARIES,
                        help='Libraries to skip (default: AudioBooks, Mike\'s Audio Books)')
     parser.add_argument('--no-verify', action='store_true', 
                        help='Skip file existence verification during export (faster)')
     parser.add_argument('--detailed-episodes', action='store_true',
                        help='Fetch individual episode details for TV shows (slower but enables per-episode tracking)')
+    parser.add_argument('--workers', type=int, default=LIBRARY_WORKERS,
+                       help=f'Libraries to export concurrently (default: {LIBRARY_WORKERS})')
+    parser.add_argument('--pretty', action='store_true',
+                       help='Write the backup as indented JSON (default: compact, smaller and faster)')
+    parser.add_argument('--listing-cache', metavar='DIR',
+                       help='Cache Plex library listings in DIR and reuse them while a library is unchanged')
     parser.add_argument('--batch-limit', type=int, 
                        help='Maximum number of requests to create per batch')
     parser.add_argument('--progress', 
                        help='Track progress across batches in this JSON file')
+    parser.add_argument('--request-delay', type=float, default=OVERSEERR_DELAY,
+                       help=f'Average seconds between Overseerr requests (default: {OVERSEERR_DELAY}, 0 = no delay)')
+    parser.add_argument('--request-burst', type=int, default=OVERSEERR_BURST,
+                       help=f'Overseerr requests allowed back-to-back before --request-delay pacing applies (default: {OVERSEERR_BURST})')
     parser.add_argument('--auto-approve', action='store_true',
                        help='Auto-approve requests (default: requests need manual approval)')
     parser.add_argument('--force', action='store_true',
@@ -1238,24 +1792,14 @@ def main():
             args.export,
             verify_files=not args.no_verify,
             skip_libraries=args.skip_libraries,
-            detailed_episodes=args.detailed_episodes
+            detailed_episodes=args.detailed_episodes,
+            workers=args.workers,
+            pretty=args.pretty,
+            listing_cache=args.listing_cache
         )
-        
-        
-        logger.info("=" * 60)
-        logger.info("Export Statistics:")
-        logger.info(f"  Total items: {stats['total_items']}")
-        logger.info(f"  Movies: {stats['movies']}")
-        logger.info(f"  TV Shows: {stats['shows']}")
-        if stats.get('episodes', 0) > 0:
-            logger.info(f"  Episodes tracked: {stats['episodes']}")
-            logger.info(f"  Missing episodes: {stats.get('missing_episodes', 0)}")
-        logger.info(f"  Verified (files exist): {stats['verified_items']}")
-        logger.info(f"  Missing files: {stats['missing_files']}")
-        logger.info(f"  Errors: {stats['errors']}")
-        logger.info("=" * 60)
+        log_export_stats(stats)
     
-    if args.__dict__.get('import'):
+    if args.import_file:
         if not args.overseerr_url or not args.overseerr_token:
             logger.error("--overseerr-url and --overseerr-token required for restore")
             sys.exit(1)
@@ -1268,7 +1812,7 @@ def main():
                 logger.info(f"  Sonarr: {args.sonarr_url}")
         
         stats = plex.restore_to_overseerr(
-            args.__dict__.get('import'),
+            args.import_file,
             args.overseerr_url,
             args.overseerr_token,
             args.plex_url,
@@ -1280,7 +1824,9 @@ def main():
             radarr_url=args.radarr_url,
             radarr_token=args.radarr_token,
             sonarr_url=args.sonarr_url,
-            sonarr_token=args.sonarr_token
+            sonarr_token=args.sonarr_token,
+            request_delay=args.request_delay,
+            request_burst=args.request_burst
         )
         
         
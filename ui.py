@@ -6,18 +6,30 @@ Simple web interface for backup and restoration operations
 
 import os
 import sys
+import atexit
+import base64
+import gzip
 import json
+import shutil
 import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import logging
 
 try:
-    from flask import Flask, render_template_string, request, jsonify
+    from flask import Flask, Response, request, jsonify, stream_with_context
 except ImportError:
     print("Flask is required. Install with: pip install flask")
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Suppress SSL warnings for self-signed certs
 import urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -32,6 +44,23 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 VERSION = "3.1"
+UI_THREADS = 8  # gunicorn worker threads when PRODUCTION=1
+OUTPUT_CHUNK_SIZE = 65536  # Max bytes of subprocess output read per chunk
+STAT_WORKERS = 32  # Concurrent file checks when reviewing (NAS/NFS round trips)
+BACKUP_CACHE_SIZE = 4  # Parsed backups kept in memory, keyed by (path, mtime, size)
+
+_backup_cache = OrderedDict()
+_backup_cache_lock = threading.Lock()
+_http_session = None
+_running_processes = set()
+_running_processes_lock = threading.Lock()
+
+
+def parse_json(raw):
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 class Config:
@@ -39,43 +68,113 @@ class Config:
     
     def __init__(self, config_file='config.json'):
         self.config_file = Path(config_file)
+        self._lock = threading.Lock()
+        self._mtime_ns = None
         self.data = self._load()
     
+    def _stat_mtime(self):
+        """Return config file mtime in ns, or None if it doesn't exist"""
+        try:
+            return self.config_file.stat().st_mtime_ns
+        except OSError:
+            return None
+    
     def _load(self):
         """Load config from file"""
-        if self.config_file.exists():
+        self._mtime_ns = self._stat_mtime()
+        if self._mtime_ns is not None:
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return parse_json(self.config_file.read_bytes())
             except Exception as e:
                 logger.error(f"Error loading config: {e}")
                 return {}
         return {}
     
+    def _refresh(self):
+        """Re-read config.json if it changed on disk (e.g. edited by hand)"""
+        mtime_ns = self._stat_mtime()
+        if mtime_ns is None or mtime_ns == self._mtime_ns:
+            return
+        with self._lock:
+            if mtime_ns == self._mtime_ns:
+                return
+            # Remember this version even if it's unusable, so a half-written file is
+            # retried once it changes again rather than on every get()
+            self._mtime_ns = mtime_ns
+            try:
+                data = parse_json(self.config_file.read_bytes())
+                if not isinstance(data, dict):
+                    raise ValueError("top level is not an object")
+            except Exception as e:
+                logger.warning(f"Failed to reload config, keeping previous settings: {e}")
+                return
+            self.data = data
+            logger.info(f"Reloaded config: {self.config_file}")
+    
     def save(self):
         """Save config to file"""
+        with self._lock:
+            self._save()
+    
+    def _save(self):
+        """Write config to file; caller holds the lock"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=2)
+            # Write to a temp file and swap it in so a crash never leaves a truncated config
+            temp_file = self.config_file.with_name(self.config_file.name + '.tmp')
+            if orjson is not None:
+                temp_file.write_bytes(orjson.dumps(self.data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.data, f, indent=2)
+            os.replace(temp_file, self.config_file)
+            self._mtime_ns = self._stat_mtime()
             logger.warning("⚠️  Config saved with API tokens in plain text. Keep config.json secure!")
         except Exception as e:
             logger.error(f"Error saving config: {e}")
     
     def get(self, key, default=None):
         """Get config value"""
+        self._refresh()
         return self.data.get(key, default)
     
     def set(self, key, value):
         """Set config value"""
-        self.data[key] = value
-        self.save()
+        with self._lock:
+            self.data[key] = value
+            self._save()
+    
+    def update(self, values):
+        """Set several config values with a single write"""
+        with self._lock:
+            self.data.update(values)
+            self._save()
 
 
 app = Flask(__name__)
+
+if orjson is not None:
+    try:
+        from flask.json.provider import DefaultJSONProvider
+    except ImportError:  # Flask < 2.2 has no pluggable JSON provider
+        DefaultJSONProvider = None
+    
+    if DefaultJSONProvider is not None:
+        class OrjsonProvider(DefaultJSONProvider):
+            """Flask JSON provider backed by orjson for request parsing and jsonify"""
+            
+            def dumps(self, obj, **kwargs):
+                return orjson.dumps(obj, default=self.default).decode('utf-8')
+            
+            def loads(self, s, **kwargs):
+                return orjson.loads(s)
+        
+        app.json = OrjsonProvider(app)
+
 config = Config()
 
 
 FAVICON_B64 = "iVBORw0KGgoAAAANSUhEUgAAACAAAAAgCAIAAAD8GO2jAAAAmUlEQVR42mNIq3uVVvM8veppeuXjjPKHGWX3MkvuZBbdyiq8kZV/NTvvcnbOxZys8zmZZ3LTT+WmnchLOZaXdDg/8WB+/P6CuL0FMbsKo3YURm4rCt9SFLaxOGR9cdDaksDVJf4rSv2WlfosYRi1YARb8J84MGoB8YAiC3BF8qgF9LOA5pE8mg9Gk+loPhitcEabLaMWUGoBAH+/pSbY2I7NAAAAAElFTkSuQmCC"
+FAVICON_BYTES = base64.b64decode(FAVICON_B64)
 
 HTML = """<!DOCTYPE html>
 <html>
@@ -428,12 +527,7 @@ function startBackup() {
     showOutput('backupOutput');
     showStatusLoading('backupStatus', d ? 'Scanning Plex library with detailed episode tracking (this may take a while)...' : 'Scanning Plex library...');
     
-    fetch('/api/backup', {
-        method: 'POST',
-        headers: {'Content-Type': 'application/json'},
-        body: JSON.stringify({backup_dir: b, verify_files: v, detailed_episodes: d, compress: c, libraries: t})
-    }).then(r => r.json()).then(d => {
-        document.getElementById('backupOutput').textContent = d.output || 'No output';
+    streamOutput('/api/backup', {backup_dir: b, verify_files: v, detailed_episodes: d, compress: c, libraries: t}, 'backupOutput').then(d => {
         showStatus('backupStatus', d.success ? 'Backup complete: ' + d.file : 'Failed: ' + d.error, d.success ? 'success' : 'error');
         loadLastBackupInfo();
     }).catch(e => showStatus('backupStatus', 'Error: ' + e, 'error'))
@@ -457,8 +551,8 @@ function loadMissingItems() {
         body: JSON.stringify({backup_file: f})
     }).then(r => r.json()).then(d => {
         if (d.success) {
-            missingItemsData = d.items;
-            renderMissingList(d.items, d.by_library);
+            missingItemsData = Object.values(d.by_library).flat();
+            renderMissingList(missingItemsData, d.by_library);
             document.getElementById('selectionControls').style.display = 'flex';
             document.getElementById('missingList').style.display = 'block';
             document.getElementById('restoreSelectedControls').style.display = 'block';
@@ -649,12 +743,7 @@ function startRestoreBatch() {
     showOutput('restoreOutput');
     showStatusLoading('restoreStatus', f ? 'Creating requests with force mode (batch size: ' + s + ')...' : 'Creating requests (batch size: ' + s + ')...');
     
-    fetch('/api/restore-batch', {
-        method: 'POST',
-        headers: {'Content-Type': 'application/json'},
-        body: JSON.stringify({backup_file: b, batch_limit: s, force: f})
-    }).then(r => r.json()).then(d => {
-        document.getElementById('restoreOutput').textContent = d.output || 'No output';
+    streamOutput('/api/restore-batch', {backup_file: b, batch_limit: s, force: f}, 'restoreOutput').then(d => {
         showStatus('restoreStatus', d.success ? 'Batch complete - check Overseerr for new requests' : 'Failed: ' + d.error, d.success ? 'success' : 'error');
     }).catch(e => showStatus('restoreStatus', 'Error', 'error'))
     .finally(() => { document.getElementById('restoreBatchBtn').disabled = false; });
@@ -678,17 +767,47 @@ function startRestoreFull() {
     showOutput('restoreOutput');
     showStatusLoading('restoreStatus', f ? 'Creating all requests with force mode...' : 'Creating all requests...');
     
-    fetch('/api/restore-full', {
-        method: 'POST',
-        headers: {'Content-Type': 'application/json'},
-        body: JSON.stringify({backup_file: b, batch_limit: s, force: f})
-    }).then(r => r.json()).then(d => {
-        document.getElementById('restoreOutput').textContent = d.output || 'No output';
+    streamOutput('/api/restore-full', {backup_file: b, batch_limit: s, force: f}, 'restoreOutput').then(d => {
         showStatus('restoreStatus', d.success ? 'All requests created - check Overseerr' : 'Failed: ' + d.error, d.success ? 'success' : 'error');
     }).catch(e => showStatus('restoreStatus', 'Error', 'error'))
     .finally(() => { document.getElementById('restoreFullBtn').disabled = false; });
 }
 
+function streamOutput(url, body, outputId) {
+    // POST, then append server-sent output lines as they arrive; resolves with the final event
+    const out = document.getElementById(outputId),
+          nl = String.fromCharCode(10);
+    out.textContent = '';
+    return fetch(url, {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify(body)
+    }).then(r => {
+        if (!(r.headers.get('Content-Type') || '').startsWith('text/event-stream')) {
+            return r.json().then(d => { out.textContent = d.output || 'No output'; return d; });
+        }
+        const reader = r.body.getReader(), decoder = new TextDecoder();
+        let buffer = '', result = {success: false, error: 'Connection closed'};
+        const pump = () => reader.read().then(({done, value}) => {
+            if (done) return result;
+            buffer += decoder.decode(value, {stream: true});
+            let i;
+            while ((i = buffer.indexOf(nl + nl)) >= 0) {
+                const event = JSON.parse(buffer.slice('data: '.length, i));
+                buffer = buffer.slice(i + 2);
+                if (event.done) {
+                    result = event;
+                } else {
+                    out.textContent += event.line + nl;
+                    out.scrollTop = out.scrollHeight;
+                }
+            }
+            return pump();
+        });
+        return pump();
+    });
+}
+
 function showStatus(e, m, t) {
     const el = document.getElementById(e);
     el.innerHTML = '<div class="status-text">' + m + '</div>';
@@ -709,19 +828,30 @@ function showOutput(e) {
 </html>
 """
 
+# Compressed once at startup; the page never changes while the server runs
+HTML_GZIP = gzip.compress(HTML.encode('utf-8'), compresslevel=9)
+
 
 @app.route('/')
 def index():
-    return render_template_string(HTML)
+    # The page is static, so skip Jinja and let the browser reuse it briefly
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = Response(HTML_GZIP, mimetype='text/html')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(HTML, mimetype='text/html')
+    response.headers['Cache-Control'] = 'public, max-age=60'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
 
 
 @app.route('/favicon.ico')
 def favicon():
     """Serve favicon to avoid 404 errors"""
-    import base64
-    from flask import Response
-    icon_data = base64.b64decode(FAVICON_B64)
-    return Response(icon_data, mimetype='image/png')
+    response = Response(FAVICON_BYTES, mimetype='image/png')
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    response.add_etag()
+    return response.make_conditional(request)
 
 
 @app.route('/api/settings', methods=['GET', 'POST'])
@@ -739,22 +869,39 @@ def settings():
             'backup_dir': config.get('backup_dir', './backups')
         })
     data = request.json
-    config.set('plex_url', data.get('plex_url', ''))
-    config.set('plex_token', data.get('plex_token', ''))
-    config.set('overseerr_url', data.get('overseerr_url', ''))
-    config.set('overseerr_token', data.get('overseerr_token', ''))
-    config.set('radarr_url', data.get('radarr_url', ''))
-    config.set('radarr_token', data.get('radarr_token', ''))
-    config.set('sonarr_url', data.get('sonarr_url', ''))
-    config.set('sonarr_token', data.get('sonarr_token', ''))
-    config.set('backup_dir', data.get('backup_dir', './backups'))
+    config.update({
+        'plex_url': data.get('plex_url', ''),
+        'plex_token': data.get('plex_token', ''),
+        'overseerr_url': data.get('overseerr_url', ''),
+        'overseerr_token': data.get('overseerr_token', ''),
+        'radarr_url': data.get('radarr_url', ''),
+        'radarr_token': data.get('radarr_token', ''),
+        'sonarr_url': data.get('sonarr_url', ''),
+        'sonarr_token': data.get('sonarr_token', ''),
+        'backup_dir': data.get('backup_dir', './backups')
+    })
     return jsonify({'success': True})
 
 
+def get_http_session():
+    """Return a shared keep-alive session for connection tests"""
+    global _http_session
+    if _http_session is None:
+        import requests as req
+        from requests.adapters import HTTPAdapter
+        
+        session = req.Session()
+        session.trust_env = False
+        session.verify = False
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _http_session = session
+    return _http_session
+
+
 @app.route('/api/test-connection')
 def test_connection():
-    import requests as req
-    
     results = []
     
     # Test Plex
@@ -764,10 +911,8 @@ def test_connection():
     if not plex_url or not plex_token:
         return jsonify({'success': False, 'error': 'Plex URL and token required'})
     
+    session = get_http_session()
     try:
-        session = req.Session()
-        session.trust_env = False
-        session.verify = False
         response = session.get(
             f'{plex_url.rstrip("/")}/identity',
             headers={'X-Plex-Token': plex_token, 'Accept': 'application/json'},
@@ -845,19 +990,21 @@ def last_backup():
         if not backup_dir.exists():
             return jsonify({'success': False, 'error': 'Backup directory does not exist'})
         
-        # Find both .json and .json.gz backups
-        json_backups = list(backup_dir.glob('plex_library_*.json'))
-        gz_backups = list(backup_dir.glob('plex_library_*.json.gz'))
-        all_backups = json_backups + gz_backups
-        
-        # Sort by modification time, newest first
-        all_backups = sorted(all_backups, key=lambda f: f.stat().st_mtime, reverse=True)
+        # Single pass for the newest .json/.json.gz backup (restore progress files share the prefix)
+        latest = None
+        stat = None
+        with os.scandir(backup_dir) as it:
+            for entry in it:
+                name = entry.name
+                if (name.startswith('plex_library_') and name.endswith(('.json', '.json.gz'))
+                        and not name.endswith('_progress.json') and entry.is_file()):
+                    entry_stat = entry.stat()
+                    if stat is None or entry_stat.st_mtime > stat.st_mtime:
+                        latest, stat = Path(entry.path), entry_stat
         
-        if not all_backups:
+        if latest is None:
             return jsonify({'success': False, 'error': 'No backups found'})
         
-        latest = all_backups[0]
-        stat = latest.stat()
         size_kb = stat.st_size / 1024
         mtime = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M')
         
@@ -874,6 +1021,77 @@ def last_backup():
         return jsonify({'success': False, 'error': str(e)})
 
 
+def sse_event(payload):
+    """Format a payload as a server-sent event"""
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+def stream_process(cmd):
+    """
+    Run a command and yield its output lines as server-sent events
+    
+    Args:
+        cmd: Command line to run
+    
+    Returns:
+        The process return code (as the generator's return value)
+    """
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=os.getcwd(), bufsize=OUTPUT_CHUNK_SIZE)
+    with _running_processes_lock:
+        _running_processes.add(process)
+    try:
+        # read1 returns whatever is available, so a burst of lines becomes one event
+        pending = b''
+        while True:
+            chunk = process.stdout.read1(OUTPUT_CHUNK_SIZE)
+            if not chunk:
+                break
+            *lines, pending = (pending + chunk).split(b'\n')
+            if lines:
+                text = '\n'.join(line.decode('utf-8', 'replace').rstrip() for line in lines)
+                yield sse_event({'line': text})
+        if pending:
+            yield sse_event({'line': pending.decode('utf-8', 'replace').rstrip()})
+        returncode = process.wait()
+        _forget_process(process)
+        return returncode
+    finally:
+        # Client went away mid-run: let the backup/restore finish, draining
+        # its output so the child never blocks on a full pipe
+        if process.poll() is None:
+            threading.Thread(target=_finish_process, args=(process,), daemon=True).start()
+        else:
+            _forget_process(process)
+
+
+def _forget_process(process):
+    """Stop tracking a finished child process"""
+    with _running_processes_lock:
+        _running_processes.discard(process)
+
+
+def _finish_process(process):
+    """Discard the output of a child whose client disconnected and wait for it to exit"""
+    try:
+        while process.stdout.read1(OUTPUT_CHUNK_SIZE):
+            pass
+        returncode = process.wait()
+        logger.info(f"Detached process {process.pid} finished with exit code {returncode}")
+    finally:
+        _forget_process(process)
+
+
+@atexit.register
+def _kill_running_processes():
+    """Kill children still running when the server shuts down"""
+    with _running_processes_lock:
+        processes = list(_running_processes)
+    for process in processes:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
 @app.route('/api/backup', methods=['POST'])
 def backup():
     try:
@@ -885,8 +1103,11 @@ def backup():
         backup_dir = Path(data.get('backup_dir', './backups'))
         backup_dir.mkdir(parents=True, exist_ok=True)
         
+        # Compression is on by default; the CLI gzips while writing when given a .gz name
+        compress = data.get('compress', True)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_file = backup_dir / f"plex_library_{timestamp}.json"
+        suffix = '.json.gz' if compress else '.json'
+        backup_file = backup_dir / f"plex_library_{timestamp}{suffix}"
         
         cmd = [sys.executable, '-u', str(script), '--plex-url', config.get('plex_url', ''), '--plex-token', config.get('plex_token', ''), '--export', str(backup_file)]
         
@@ -903,106 +1124,153 @@ def backup():
         logger.info(f"Running backup to {backup_file}")
         if data.get('detailed_episodes'):
             logger.info("Detailed episode tracking enabled - this may take a while")
-        output = []
-        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, cwd=os.getcwd(), bufsize=1, encoding='utf-8', errors='replace')
-        for line in iter(process.stdout.readline, ''):
-            if line:
-                output.append(line.rstrip())
-        process.wait()
-        
-        # Handle compression if requested (default: True)
-        compress = data.get('compress', True)
-        final_file = backup_file
         
-        if compress and process.returncode == 0 and backup_file.exists():
-            import gzip
-            import shutil
-            compressed_file = Path(str(backup_file) + '.gz')
+        def generate():
             try:
-                original_size = backup_file.stat().st_size
-                with open(backup_file, 'rb') as f_in:
-                    with gzip.open(compressed_file, 'wb', compresslevel=9) as f_out:
-                        shutil.copyfileobj(f_in, f_out)
-                compressed_size = compressed_file.stat().st_size
-                reduction = (1 - compressed_size / original_size) * 100 if original_size > 0 else 0
-                # Remove original, keep compressed
-                backup_file.unlink()
-                final_file = compressed_file
-                output.append(f"Compressed: {original_size/1024:.1f} KB → {compressed_size/1024:.1f} KB ({reduction:.1f}% reduction)")
-                logger.info(f"Compressed backup: {original_size/1024:.1f} KB → {compressed_size/1024:.1f} KB ({reduction:.1f}% reduction)")
+                returncode = yield from stream_process(cmd)
+                logger.info(f"Backup finished with exit code {returncode}")
+                
+                if returncode == 0 and backup_file.exists():
+                    yield sse_event({'line': f"Backup size: {backup_file.stat().st_size/1024:.1f} KB"})
+                
+                yield sse_event({'done': True, 'success': returncode == 0, 'error': f'Exit code {returncode}', 'file': str(backup_file)})
             except Exception as e:
-                logger.warning(f"Compression failed: {e}")
-                output.append(f"Compression failed: {e}")
+                yield sse_event({'done': True, 'success': False, 'error': str(e)})
         
-        return jsonify({'success': process.returncode == 0, 'output': '\n'.join(output), 'file': str(final_file)})
+        return Response(stream_with_context(generate()), mimetype='text/event-stream')
     except Exception as e:
         return jsonify({'success': False, 'error': str(e), 'output': ''})
 
 
-def load_backup_file(backup_file_path):
-    """Load and decompress backup file if needed"""
-    import gzip
+def resolve_backup_file(backup_file_path):
+    """
+    Find a backup by file name in the configured backup directory
+    
+    Directory components are dropped, so only files inside the backup
+    directory (or the default ./backups) can be opened.
+    
+    Args:
+        backup_file_path: Backup file name as sent by the browser
     
-    # Try multiple possible paths
-    possible_paths = [
-        Path(backup_file_path),
-        Path('./backups') / backup_file_path,
-        Path(config.get('backup_dir', './backups')) / backup_file_path,
-    ]
+    Returns:
+        Path to the backup file, or None if not found
+    """
+    name = Path(backup_file_path).name
+    if not name or name in ('.', '..'):
+        return None
     
-    backup_file = None
-    for path in possible_paths:
-        if path.exists():
-            backup_file = path
-            break
+    backup_dir = os.path.abspath(config.get('backup_dir', './backups'))
+    candidates = [backup_dir]
+    default_dir = os.path.abspath('./backups')
+    if default_dir != backup_dir:
+        candidates.append(default_dir)
     
+    for directory in candidates:
+        path = Path(directory) / name
+        if path.is_file():
+            return path
+    return None
+
+
+def load_backup_file(backup_file_path):
+    """Load and decompress backup file if needed"""
+    backup_file = resolve_backup_file(backup_file_path)
     if backup_file is None:
         return None, f'Backup file not found: {backup_file_path}'
     
     try:
+        # Reuse the parsed backup until the file changes on disk
+        st = backup_file.stat()
+        key = (str(backup_file.resolve()), st.st_mtime_ns, st.st_size)
+        with _backup_cache_lock:
+            backup_data = _backup_cache.get(key)
+            if backup_data is not None:
+                _backup_cache.move_to_end(key)
+                return backup_data, backup_file
+        
         # Check if it's gzipped
         if str(backup_file).endswith('.gz'):
-            with gzip.open(backup_file, 'rt', encoding='utf-8') as f:
-                backup_data = json.load(f)
+            # One read and one C-level inflate instead of GzipFile's small chunked reads
+            backup_data = parse_json(gzip.decompress(backup_file.read_bytes()))
         else:
-            with open(backup_file, 'r', encoding='utf-8') as f:
-                backup_data = json.load(f)
+            backup_data = parse_json(backup_file.read_bytes())
+        
+        with _backup_cache_lock:
+            _backup_cache[key] = backup_data
+            while len(_backup_cache) > BACKUP_CACHE_SIZE:
+                _backup_cache.popitem(last=False)
         return backup_data, backup_file
     except Exception as e:
         return None, f'Error loading backup: {e}'
 
 
+def stat_file_sizes(paths):
+    """
+    Stat many files concurrently
+    
+    Args:
+        paths: File paths to check (duplicates are checked once)
+    
+    Returns:
+        Dict of path -> size in bytes, or the exception raised for that path
+    """
+    def stat_one(path):
+        try:
+            return os.stat(path).st_size
+        except (OSError, ValueError) as e:
+            return e
+    
+    unique_paths = list(dict.fromkeys(paths))
+    if not unique_paths:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(STAT_WORKERS, len(unique_paths))) as executor:
+        return dict(zip(unique_paths, executor.map(stat_one, unique_paths)))
+
+
 def analyze_missing_items(backup_data):
     """Analyze backup and return missing items with full metadata"""
     missing_items = []
     by_library = {}
+    libraries = backup_data.get('libraries', {})
     
-    for lib_name, items in backup_data.get('libraries', {}).items():
-        by_library[lib_name] = []
+    # Check every file up front so slow network mounts are stat'ed in parallel
+    paths = []
+    for items in libraries.values():
+        for item in items:
+            if item['type'] == 'movie':
+                if item.get('file_path'):
+                    paths.append(item['file_path'])
+            elif item.get('detailed') and 'season_details' in item:
+                for season in item['season_details']:
+                    paths.extend(ep['file_path'] for ep in season.get('episodes', []) if ep.get('file_path'))
+    file_sizes = stat_file_sizes(paths)
+    
+    for lib_name, items in libraries.items():
+        bucket = by_library[lib_name] = []
         
         for item in items:
             is_missing = False
             reason = ""
+            missing_eps = None
+            item_type = item['type']
             
-            if item['type'] == 'movie':
+            if item_type == 'movie':
                 file_path = item.get('file_path', '')
                 if file_path:
-                    try:
-                        path = Path(file_path)
-                        if not path.exists():
-                            is_missing = True
-                            reason = "File not found on disk"
-                        else:
-                            size_mb = path.stat().st_size / (1024 * 1024)
-                            reason = f"OK ({size_mb:.1f} MB)"
-                    except Exception as e:
+                    size = file_sizes[file_path]
+                    if isinstance(size, (FileNotFoundError, NotADirectoryError)):
+                        is_missing = True
+                        reason = "File not found on disk"
+                    elif isinstance(size, Exception):
                         is_missing = True
-                        reason = f"Error checking: {e}"
+                        reason = f"Error checking: {size}"
+                    else:
+                        reason = f"OK ({size / (1024 * 1024):.1f} MB)"
                 else:
                     is_missing = not item.get('file_exists', True)
                     reason = item.get('file_status', 'Unknown')
             
-            elif item['type'] == 'show':
+            elif item_type == 'show':
                 if item.get('detailed') and 'season_details' in item:
                     missing_eps = []
                     total_eps = 0
@@ -1017,11 +1285,7 @@ def analyze_missing_items(backup_data):
                             
                             ep_missing = False
                             if file_path:
-                                try:
-                                    if not Path(file_path).exists():
-                                        ep_missing = True
-                                except:
-                                    ep_missing = True
+                                ep_missing = isinstance(file_sizes[file_path], Exception)
                             elif not ep.get('file_exists', True):
                                 ep_missing = True
                             
@@ -1034,7 +1298,6 @@ def analyze_missing_items(backup_data):
                             reason = f"Missing episodes: {', '.join(missing_eps)}"
                         else:
                             reason = f"Missing {len(missing_eps)}/{total_eps} episodes"
-                        item['missing_episodes_list'] = missing_eps
                     else:
                         reason = f"TV Show: {total_eps} episodes (all present)"
                 else:
@@ -1051,7 +1314,7 @@ def analyze_missing_items(backup_data):
                     'id': item_id,
                     'library': lib_name,
                     'title': item.get('title', 'Unknown'),
-                    'type': item['type'],
+                    'type': item_type,
                     'year': item.get('year'),
                     'reason': reason,
                     'tmdb_id': item.get('tmdb_id'),
@@ -1060,14 +1323,14 @@ def analyze_missing_items(backup_data):
                 }
                 
                 # Include episode details for shows
-                if item['type'] == 'show':
+                if item_type == 'show':
                     missing_item['seasons'] = item.get('seasons')
                     missing_item['episodes'] = item.get('episodes')
-                    if item.get('missing_episodes_list'):
-                        missing_item['missing_episodes_list'] = item['missing_episodes_list']
+                    if missing_eps:
+                        missing_item['missing_episodes_list'] = missing_eps
                 
                 missing_items.append(missing_item)
-                by_library[lib_name].append(missing_item)
+                bucket.append(missing_item)
     
     return missing_items, by_library
 
@@ -1086,9 +1349,9 @@ def get_missing_items():
         backup_data = result
         missing_items, by_library = analyze_missing_items(backup_data)
         
+        # Items are only sent grouped by library; the page flattens them itself
         return jsonify({
             'success': True,
-            'items': missing_items,
             'by_library': by_library,
             'total': len(missing_items)
         })
@@ -1112,36 +1375,40 @@ def review_missing():
         backup_file = backup_file_or_error
         
         missing_items, by_library = analyze_missing_items(backup_data)
+        lib_names = sorted(by_library)
         
         # Format output
-        output = "="*80 + "\n"
-        output += "MISSING FILES REPORT\n"
-        output += f"Backup: {backup_file.name}\n"
-        output += f"Exported: {backup_data.get('exported_at', 'Unknown')}\n"
+        parts = ["="*80 + "\n"]
+        parts.append("MISSING FILES REPORT\n")
+        parts.append(f"Backup: {backup_file.name}\n")
+        parts.append(f"Exported: {backup_data.get('exported_at', 'Unknown')}\n")
         if 'stats' in backup_data:
-            output += f"Original Stats: {backup_data['stats'].get('total_items', '?')} items, "
-            output += f"{backup_data['stats'].get('movies', '?')} movies, "
-            output += f"{backup_data['stats'].get('shows', '?')} shows\n"
-        output += "="*80 + "\n\n"
+            parts.append(f"Original Stats: {backup_data['stats'].get('total_items', '?')} items, ")
+            parts.append(f"{backup_data['stats'].get('movies', '?')} movies, ")
+            parts.append(f"{backup_data['stats'].get('shows', '?')} shows\n")
+        parts.append("="*80 + "\n\n")
         
-        for lib_name in sorted(by_library.keys()):
+        summary = []
+        for lib_name in lib_names:
             items = by_library[lib_name]
+            summary.append(f"  {lib_name}: {len(items)} missing\n")
             if items:
-                output += f"\n--- {lib_name} ({len(items)} missing) ---\n"
+                parts.append(f"\n--- {lib_name} ({len(items)} missing) ---\n")
                 for item in items:
                     year = f" ({item.get('year')})" if item.get('year') else ""
                     item_type = item.get('type', 'unknown')
-                    output += f"  [{item_type.upper()}] {item.get('title', 'Unknown')}{year}\n"
+                    parts.append(f"  [{item_type.upper()}] {item.get('title', 'Unknown')}{year}\n")
                     if item.get('reason'):
-                        output += f"         {item.get('reason')}\n"
-                output += "\n"
+                        parts.append(f"         {item.get('reason')}\n")
+                parts.append("\n")
         
-        output += "\n" + "="*80 + "\n"
-        output += "SUMMARY\n"
-        output += "="*80 + "\n"
-        for lib_name in sorted(by_library.keys()):
-            output += f"  {lib_name}: {len(by_library[lib_name])} missing\n"
-        output += f"\nTotal missing: {len(missing_items)}\n"
+        parts.append("\n" + "="*80 + "\n")
+        parts.append("SUMMARY\n")
+        parts.append("="*80 + "\n")
+        parts.extend(summary)
+        parts.append(f"\nTotal missing: {len(missing_items)}\n")
+        
+        output = ''.join(parts)
         
         return jsonify({'success': True, 'output': output, 'total': len(missing_items)})
     except Exception as e:
@@ -1256,62 +1523,71 @@ def restore_selected():
         return jsonify({'success': False, 'error': str(e), 'output': ''})
 
 
+def build_restore_command(data, full=False):
+    """
+    Build the restore command line for a batch request
+    
+    Args:
+        data: Request JSON (backup_file, batch_limit, force)
+        full: Omit the batch limit so a single run restores everything
+    
+    Returns:
+        Tuple of (command list, None) or (None, error message)
+    """
+    script = Path('plex_overseerr_backup.py')
+    if not script.exists():
+        return None, 'plex_overseerr_backup.py not found'
+    
+    backup_file_path = data['backup_file']
+    backup_file = resolve_backup_file(backup_file_path)
+    if backup_file is None:
+        return None, f'Backup file not found: {backup_file_path}'
+    
+    progress_file = backup_file.parent / f"{backup_file.stem}_progress.json"
+    cmd = [sys.executable, '-u', str(script), '--plex-url', config.get('plex_url', ''), '--plex-token', config.get('plex_token', ''), '--import', str(backup_file), '--overseerr-url', config.get('overseerr_url', ''), '--overseerr-token', config.get('overseerr_token', ''), '--progress', str(progress_file)]
+    if not full:
+        cmd.extend(['--batch-limit', str(data.get('batch_limit', 10))])
+    
+    # Add --force flag if requested
+    if data.get('force', False):
+        cmd.append('--force')
+        logger.info("Force mode enabled - will clear existing media data before requesting")
+        
+        # Add Radarr credentials if configured
+        radarr_url = config.get('radarr_url', '')
+        radarr_token = config.get('radarr_token', '')
+        if radarr_url and radarr_token:
+            cmd.extend(['--radarr-url', radarr_url, '--radarr-token', radarr_token])
+            logger.info(f"  Radarr integration enabled: {radarr_url}")
+        
+        # Add Sonarr credentials if configured
+        sonarr_url = config.get('sonarr_url', '')
+        sonarr_token = config.get('sonarr_token', '')
+        if sonarr_url and sonarr_token:
+            cmd.extend(['--sonarr-url', sonarr_url, '--sonarr-token', sonarr_token])
+            logger.info(f"  Sonarr integration enabled: {sonarr_url}")
+    
+    return cmd, None
+
+
 @app.route('/api/restore-batch', methods=['POST'])
 def restore_batch():
     try:
-        data = request.json
-        script = Path('plex_overseerr_backup.py')
-        if not script.exists():
-            return jsonify({'success': False, 'error': 'plex_overseerr_backup.py not found', 'output': ''})
+        cmd, error = build_restore_command(request.json)
+        if cmd is None:
+            return jsonify({'success': False, 'error': error, 'output': ''})
         
-        backup_file_path = data['backup_file']
-        
-        # Try multiple possible paths
-        possible_paths = [
-            Path(backup_file_path),
-            Path('./backups') / backup_file_path,
-            Path(config.get('backup_dir', './backups')) / backup_file_path,
-        ]
-        
-        backup_file = None
-        for path in possible_paths:
-            if path.exists():
-                backup_file = path
-                break
-        
-        if backup_file is None:
-            return jsonify({'success': False, 'error': f'Backup file not found: {backup_file_path}', 'output': ''})
-        
-        progress_file = backup_file.parent / f"{backup_file.stem}_progress.json"
-        cmd = [sys.executable, '-u', str(script), '--plex-url', config.get('plex_url', ''), '--plex-token', config.get('plex_token', ''), '--import', str(backup_file), '--overseerr-url', config.get('overseerr_url', ''), '--overseerr-token', config.get('overseerr_token', ''), '--batch-limit', str(data.get('batch_limit', 10)), '--progress', str(progress_file)]
+        logger.info("Running restore batch")
         
-        # Add --force flag if requested
-        if data.get('force', False):
-            cmd.append('--force')
-            logger.info("Force mode enabled - will clear existing media data before requesting")
-            
-            # Add Radarr credentials if configured
-            radarr_url = config.get('radarr_url', '')
-            radarr_token = config.get('radarr_token', '')
-            if radarr_url and radarr_token:
-                cmd.extend(['--radarr-url', radarr_url, '--radarr-token', radarr_token])
-                logger.info(f"  Radarr integration enabled: {radarr_url}")
-            
-            # Add Sonarr credentials if configured
-            sonarr_url = config.get('sonarr_url', '')
-            sonarr_token = config.get('sonarr_token', '')
-            if sonarr_url and sonarr_token:
-                cmd.extend(['--sonarr-url', sonarr_url, '--sonarr-token', sonarr_token])
-                logger.info(f"  Sonarr integration enabled: {sonarr_url}")
+        def generate():
+            try:
+                returncode = yield from stream_process(cmd)
+                logger.info(f"Restore batch finished with exit code {returncode}")
+                yield sse_event({'done': True, 'success': returncode == 0, 'error': f'Exit code {returncode}'})
+            except Exception as e:
+                yield sse_event({'done': True, 'success': False, 'error': str(e)})
         
-        logger.info("Running restore batch")
-        output = []
-        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, cwd=os.getcwd(), bufsize=1, encoding='utf-8', errors='replace')
-        for line in iter(process.stdout.readline, ''):
-            if line:
-                output.append(line.rstrip())
-        process.wait()
-        return jsonify({'success': process.returncode == 0, 'output': '\n'.join(output)})
+        return Response(stream_with_context(generate()), mimetype='text/event-stream')
     except Exception as e:
         return jsonify({'success': False, 'error': str(e), 'output': ''})
 
@@ -1319,15 +1595,22 @@ def restore_batch():
 @app.route('/api/restore-full', methods=['POST'])
 def restore_full():
     try:
-        data = request.json
-        all_output = []
-        for i in range(100):
-            batch_resp = restore_batch()
-            batch_data = json.loads(batch_resp.get_data(as_text=True))
-            all_output.append(f"\n--- Batch {i+1} ---\n{batch_data['output']}\n")
-            if not batch_data['success'] or 'Batch limit reached' not in batch_data['output']:
-                break
-        return jsonify({'success': True, 'output': ''.join(all_output)})
+        # One run without a batch limit: the backup and progress are loaded once
+        cmd, error = build_restore_command(request.json, full=True)
+        if cmd is None:
+            return jsonify({'success': False, 'error': error, 'output': ''})
+        
+        logger.info("Running full restore")
+        
+        def generate():
+            try:
+                returncode = yield from stream_process(cmd)
+                logger.info(f"Full restore finished with exit code {returncode}")
+                yield sse_event({'done': True, 'success': returncode == 0, 'error': f'Exit code {returncode}'})
+            except Exception as e:
+                yield sse_event({'done': True, 'success': False, 'error': str(e)})
+        
+        return Response(stream_with_context(generate()), mimetype='text/event-stream')
     except Exception as e:
         return jsonify({'success': False, 'error': str(e), 'output': ''})
 
@@ -1353,4 +1636,10 @@ if __name__ == '__main__':
     logger.info("Press CTRL+C to stop")
     logger.info("="*60)
     logger.info("")
-    app.run(host='localhost', port=5000, debug=False)
+    if os.environ.get('PRODUCTION') == '1' and shutil.which('gunicorn'):
+        # A single worker keeps the in-memory config consistent; threads give concurrency
+        # UI_BIND=unix:/path/to.sock skips TCP when a local reverse proxy sits in front
+        bind = os.environ.get('UI_BIND', 'localhost:5000')
+        os.execvp('gunicorn', ['gunicorn', '-w', '1', '-k', 'gthread', '--threads', str(UI_THREADS),
+                               '-b', bind, 'ui:app'])
+    app.run(host='localhost', port=5000, debug=False, threaded=True)